@@ -1,16 +1,22 @@
 """Main Gradio application for Text-to-Speech with voice cloning."""
 
+import asyncio
+import functools
 import logging
-import tempfile
+import os
+import threading
 from pathlib import Path
-from typing import Tuple
+from typing import AsyncIterator, Iterator, Tuple
 
 import gradio as gr
+import numpy as np
 
-from src.voice_cloner import VoiceCloner
+from src.audio_cache import AudioCache
+from src.voice_cloner import CHUNK_MAX_LENGTH, OUTPUT_SAMPLE_RATE, VoiceCloner
 from src.example_generator import ExampleGenerator
 from src.transcript_manager import TranscriptManager
 from src.audio_processor import AudioProcessor
+from src.request_batcher import RequestBatcher
 
 # Configure logging
 logging.basicConfig(
@@ -19,81 +25,185 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize voice cloner (will be loaded on first use)
+# Concurrent requests arriving within BATCH_WINDOW_MS share one voice-sample lookup;
+# each request is answered as soon as its own text is synthesized
+MAX_BATCH_SIZE = 4
+BATCH_WINDOW_MS = 20.0
+
+# Recently synthesized audio is reused for repeated texts (e.g. example clicks)
+AUDIO_CACHE_SIZE = 256
+AUDIO_CACHE_MAX_TEXT_LENGTH = 1000
+AUDIO_CACHE_DIR = Path("Sound") / ".cache" / "audio"
+AUDIO_CACHE_MAX_DISK_ENTRIES = 1024
+
+# Static interface text
+INTRO_MARKDOWN = """
+# 🎙️ Text-to-Speech with Voice Cloning
+
+TTS application with voice cloning capabilities from game audio samples.
+Uses XTTS v2 to generate deep, narrator-style voice from Darkest Dungeon audio samples.
+
+**Note**: First-time use may take time to download models (~2GB).
+"""
+
+EXAMPLES_HINT_MARKDOWN = "*Click any example below to use it. Examples are shuffled on each app start.*"
+
+TRANSCRIPT_TAB_MARKDOWN = """
+### Manage Transcripts for Training Dataset
+
+Create transcripts for audio files to prepare a training dataset for fine-tuning.
+Listen to each audio file and enter its transcript below.
+"""
+
+# Transcript statistics shown in the Transcript Management tab
+STATS_TEMPLATE = """
+**Statistics:**
+- Total audio files: {total_audio_files}
+- With transcript: {with_transcript}
+- Without transcript: {without_transcript}
+- Completion: {completion_percentage:.1f}%
+"""
+
+# Initialize voice cloner (warmed up in the background by main(), or on first use)
 _voice_cloner: VoiceCloner | None = None
+_voice_cloner_lock = threading.Lock()
 
 
 def get_voice_cloner() -> VoiceCloner:
     """Get or initialize voice cloner instance.
 
+    Thread-safe: a request arriving while the model is still warming up blocks
+    on the same initialization instead of starting a second one.
+
     Returns:
         VoiceCloner instance
     """
     global _voice_cloner
-    
+
     if _voice_cloner is None:
-        logger.info("Initializing voice cloner...")
-        _voice_cloner = VoiceCloner(sound_dir="Sound")
-        try:
-            _voice_cloner.initialize(require_transcript=True)
-        except ValueError as e:
-            if "No audio files with transcripts" in str(e):
-                logger.error(str(e))
-                raise RuntimeError(
-                    "No audio files with transcripts found!\n\n"
-                    "Please run the transcription script first:\n"
-                    "  python scripts/transcribe_audio.py\n\n"
-                    "This will automatically transcribe all audio files using Whisper."
-                ) from e
-            raise
-        except Exception as e:
-            logger.error(f"Error initializing voice cloner: {e}")
-            raise
+        with _voice_cloner_lock:
+            if _voice_cloner is None:
+                logger.info("Initializing voice cloner...")
+                voice_cloner = VoiceCloner(sound_dir="Sound")
+                try:
+                    voice_cloner.initialize(require_transcript=True)
+                except ValueError as e:
+                    if "No audio files with transcripts" in str(e):
+                        logger.error(str(e))
+                        raise RuntimeError(
+                            "No audio files with transcripts found!\n\n"
+                            "Please run the transcription script first:\n"
+                            "  python scripts/transcribe_audio.py\n\n"
+                            "This will automatically transcribe all audio files using Whisper."
+                        ) from e
+                    raise
+                except Exception as e:
+                    logger.error(f"Error initializing voice cloner: {e}")
+                    raise
+                # Publish only a fully initialized instance
+                _voice_cloner = voice_cloner
     return _voice_cloner
 
 
-def synthesize_text(text: str) -> Tuple[str | None, str | None]:
-    """Synthesize text to speech.
+def warm_up_voice_cloner() -> None:
+    """Load the voice cloner and run a dummy synthesis before the first request.
+
+    Errors are logged instead of raised; the first request will retry the
+    initialization and report the failure in the UI.
+    """
+    try:
+        get_voice_cloner().warm_up()
+        logger.info("Voice cloner warmed up")
+    except Exception as e:
+        logger.error(f"Voice cloner warm-up failed: {e}")
+
+
+@functools.lru_cache(maxsize=1)
+def get_example_generator() -> ExampleGenerator:
+    """Get the shared example generator.
+
+    The example corpus is loaded once per process; each interface build only
+    draws a fresh shuffled selection from it.
+
+    Returns:
+        ExampleGenerator instance
+    """
+    return ExampleGenerator()
+
+
+def _synthesize_batch(texts: list[str]) -> Iterator[np.ndarray | Exception]:
+    """Synthesize a batch of texts collected by the request batcher.
+
+    Args:
+        texts: Stripped input texts
+
+    Returns:
+        Iterator over audio arrays (or per-text exceptions), yielded as each
+        text finishes so earlier requests are not held back by later ones
+    """
+    return get_voice_cloner().iter_synthesize_batch(texts, return_exceptions=True)
+
+
+_synthesis_batcher: RequestBatcher[np.ndarray] = RequestBatcher(
+    _synthesize_batch,
+    max_batch_size=MAX_BATCH_SIZE,
+    batch_window_ms=BATCH_WINDOW_MS,
+)
+
+_audio_cache = AudioCache(
+    max_entries=AUDIO_CACHE_SIZE,
+    max_text_length=AUDIO_CACHE_MAX_TEXT_LENGTH,
+    cache_dir=AUDIO_CACHE_DIR,
+    sample_rate=OUTPUT_SAMPLE_RATE,
+    max_disk_entries=AUDIO_CACHE_MAX_DISK_ENTRIES,
+)
+
+
+async def lookup_cached_audio(text: str) -> Tuple[str, np.ndarray | None]:
+    """Look up cached audio for a text in the current voice, off the event loop.
 
     Args:
-        text: Input text
+        text: Stripped input text
 
     Returns:
-        Tuple of (audio_file_path, error_message)
+        Tuple of (voice_id, cached audio array or None)
     """
-    if not text or not text.strip():
-        return None, "Please enter some text"
 
+    def lookup() -> Tuple[str, np.ndarray | None]:
+        voice_id = get_voice_cloner().get_voice_id()
+        return voice_id, _audio_cache.get(text, voice_id)
+
+    return await asyncio.to_thread(lookup)
+
+
+async def synthesize_uncached(
+    text: str, voice_id: str
+) -> Tuple[Tuple[int, np.ndarray] | None, str | None]:
+    """Synthesize text that missed the audio cache, and cache the result.
+
+    Args:
+        text: Stripped input text
+        voice_id: Voice identity the result is cached under
+
+    Returns:
+        Tuple of ((sample_rate, audio_array), error_message)
+    """
     try:
         logger.info(f"Synthesizing text: {text[:50]}...")
 
-        voice_cloner = get_voice_cloner()
+        # Synthesize with voice cloning, keeping the audio in memory
+        audio_array = await _synthesis_batcher.submit(text)
 
-        # Create temporary file for output
-        with tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=".wav",
-            dir=tempfile.gettempdir(),
-        ) as tmp_file:
-            output_path = tmp_file.name
+        # Verify the audio has content
+        min_samples = int(OUTPUT_SAMPLE_RATE * 0.05)
+        if audio_array.size < min_samples:  # Less than 50ms is suspicious
+            return None, f"Error: Generated audio is too short ({audio_array.size} samples)"
 
-        # Synthesize with voice cloning
-        audio_array = voice_cloner.synthesize_simple(
-            text=text.strip(),
-            output_path=output_path,
+        logger.info(
+            f"Successfully generated audio: {audio_array.size / OUTPUT_SAMPLE_RATE:.2f}s"
         )
-        
-        # Verify the file was created and has content
-        import os
-        if not os.path.exists(output_path):
-            return None, "Error: Audio file was not created"
-        
-        file_size = os.path.getsize(output_path)
-        if file_size < 1000:  # Less than 1KB is suspicious
-            return None, f"Error: Audio file is too small ({file_size} bytes)"
-
-        logger.info(f"Successfully generated audio: {output_path} (size: {file_size} bytes)")
-        return output_path, None
+        await asyncio.to_thread(_audio_cache.put, text, audio_array, voice_id)
+        return (OUTPUT_SAMPLE_RATE, audio_array), None
 
     except Exception as e:
         error_msg = f"Error generating audio: {str(e)}"
@@ -101,9 +211,41 @@ def synthesize_text(text: str) -> Tuple[str | None, str | None]:
         return None, error_msg
 
 
+async def stream_text(text: str, voice_id: str) -> AsyncIterator[np.ndarray]:
+    """Synthesize long text chunk by chunk, yielding audio as each chunk is ready.
+
+    The complete audio is cached once the stream finishes.
+
+    Args:
+        text: Stripped input text
+        voice_id: Voice identity the complete audio is cached under
+
+    Yields:
+        Audio arrays at OUTPUT_SAMPLE_RATE
+    """
+    voice_cloner = await asyncio.to_thread(get_voice_cloner)
+    chunks = voice_cloner.synthesize_streaming(text)
+    streamed = []
+
+    while True:
+        # The engine serializes model calls, so chunks interleave with other requests
+        audio_chunk = await asyncio.to_thread(next, chunks, None)
+        if audio_chunk is None:
+            break
+        streamed.append(audio_chunk)
+        yield audio_chunk
+
+    if streamed:
+        await asyncio.to_thread(_audio_cache.put, text, np.concatenate(streamed), voice_id)
+
+
+@functools.lru_cache(maxsize=1)
 def create_interface() -> gr.Blocks:
     """Create Gradio interface.
 
+    The Blocks are built once per process; later calls (e.g. from a reloader or
+    a mounting ASGI app) reuse the same interface.
+
     Returns:
         Gradio Blocks interface
     """
@@ -111,34 +253,28 @@ def create_interface() -> gr.Blocks:
         with gr.Row():
             # Left column: Overview (1/3 screen)
             with gr.Column(scale=1):
-                gr.Markdown(
-                    """
-                    # 🎙️ Text-to-Speech with Voice Cloning
-
-                    TTS application with voice cloning capabilities from game audio samples.
-                    Uses XTTS v2 to generate deep, narrator-style voice from Darkest Dungeon audio samples.
-
-                    **Note**: First-time use may take time to download models (~2GB).
-                    """
-                )
+                gr.Markdown(INTRO_MARKDOWN)
             
             # Right column: Examples (2/3 screen)
             with gr.Column(scale=2):
                 # Generate and shuffle examples
-                example_gen = ExampleGenerator()
-                examples = example_gen.get_examples(count=100, shuffle=True)
+                examples = get_example_generator().get_examples(count=100, shuffle=True)
 
                 gr.Markdown("### 📝 Example Texts")
-                gr.Markdown("*Click any example below to use it. Examples are shuffled on each app start.*")
+                gr.Markdown(EXAMPLES_HINT_MARKDOWN)
                 
                 # Create hidden text_input for examples binding
                 temp_text_for_examples = gr.Textbox(visible=False)
                 
+                # Examples only fill the text box (no fn to run), so there is nothing to
+                # cache; disable caching explicitly so GRADIO_CACHE_EXAMPLES or Spaces
+                # defaults never pre-process all examples before launch.
                 example_selector = gr.Examples(
                     examples=examples,
                     inputs=[temp_text_for_examples],
                     label="",
                     examples_per_page=10,  # More examples since we have more space
+                    cache_examples=False,
                 )
         
         # Define the actual visible text_input for the main form
@@ -178,7 +314,9 @@ def create_interface() -> gr.Blocks:
             with gr.Column(scale=1):
                 audio_output = gr.Audio(
                     label="Generated Audio",
-                    type="filepath",
+                    type="numpy",
+                    streaming=True,
+                    autoplay=True,
                 )
 
                 error_output = gr.Textbox(
@@ -188,39 +326,80 @@ def create_interface() -> gr.Blocks:
                 )
 
         # Event handlers
-        def generate_audio(text: str) -> Tuple[str, str, str]:
+        # Per-session (text, (sample_rate, audio)) of the last successful generation
+        last_result = gr.State(value=(None, None))
+
+        async def generate_audio(
+            text: str,
+            last: Tuple[str | None, Tuple[int, np.ndarray] | None],
+        ) -> AsyncIterator[Tuple[Tuple[int, np.ndarray] | None, str, str, tuple]]:
             """Generate audio and update UI.
 
+            Texts longer than one synthesis chunk are streamed so playback starts
+            after the first chunk; shorter (or cached) texts are returned in one piece.
+            Pressing Generate again without editing the text replays the last result.
+
             Args:
                 text: Input text
+                last: Last successful (text, audio) of this session
 
-            Returns:
-                Tuple of (audio_path, status, error)
+            Yields:
+                Tuple of ((sample_rate, audio_array), status, error, last_result)
             """
             status_msg = "Processing..."
             error_msg = ""
 
             try:
-                audio_path, error = synthesize_text(text)
-
-                if audio_path:
+                stripped = text.strip() if text else ""
+                last_text, last_audio = last
+                if stripped and stripped == last_text and last_audio is not None:
+                    yield last_audio, "Completed! (cached)", "", last
+                    return
+
+                if not stripped:
+                    yield None, "Error", "Please enter some text", last
+                    return
+
+                voice_id, cached_audio = await lookup_cached_audio(stripped)
+                if cached_audio is not None:
+                    audio = (OUTPUT_SAMPLE_RATE, cached_audio)
+                    yield audio, "Completed! (cached)", "", (stripped, audio)
+                    return
+
+                if len(stripped) > CHUNK_MAX_LENGTH:
+                    streamed = []
+                    async for audio_chunk in stream_text(stripped, voice_id):
+                        streamed.append(audio_chunk)
+                        yield (OUTPUT_SAMPLE_RATE, audio_chunk), "Streaming...", "", last
+                    # None leaves the streamed audio in place
+                    full_audio = (OUTPUT_SAMPLE_RATE, np.concatenate(streamed)) if streamed else None
+                    yield None, "Completed!", "", (stripped, full_audio)
+                    return
+
+                audio, error = await synthesize_uncached(stripped, voice_id)
+
+                if audio:
                     status_msg = "Completed!"
-                    return audio_path, status_msg, ""
+                    yield audio, status_msg, "", (stripped, audio)
                 else:
                     error_msg = error or "An error occurred"
                     status_msg = "Error"
-                    return None, status_msg, error_msg
+                    yield None, status_msg, error_msg, last
 
             except Exception as e:
                 error_msg = f"Error: {str(e)}"
                 logger.error(error_msg, exc_info=True)
                 status_msg = "Error"
-                return None, status_msg, error_msg
+                yield None, status_msg, error_msg, last
 
         generate_btn.click(
             fn=generate_audio,
-            inputs=[text_input],
-            outputs=[audio_output, status, error_output],
+            inputs=[text_input, last_result],
+            outputs=[audio_output, status, error_output, last_result],
+            # Enough concurrent handlers for the batcher to fill a batch; the engine
+            # still runs one model call at a time
+            concurrency_limit=MAX_BATCH_SIZE,
+            concurrency_id="tts",
         )
 
         def clear_all() -> Tuple[str, None, str, str]:
@@ -239,37 +418,18 @@ def create_interface() -> gr.Blocks:
         
         # Transcript Management Tab
         with gr.Tab("📝 Transcript Management"):
-            gr.Markdown(
-                """
-                ### Manage Transcripts for Training Dataset
-                
-                Create transcripts for audio files to prepare a training dataset for fine-tuning.
-                Listen to each audio file and enter its transcript below.
-                """
-            )
-            
-            # Initialize managers (will be re-initialized in functions to get fresh data)
-            def init_managers() -> tuple:
-                """Initialize transcript manager and audio processor."""
-                tm = TranscriptManager()
-                ap = AudioProcessor(sound_dir="Sound")
-                ap.discover_audio_files()
-                return tm, ap, tm.get_statistics()
+            gr.Markdown(TRANSCRIPT_TAB_MARKDOWN)
             
-            # Initial setup
-            transcript_manager, audio_processor, initial_stats = init_managers()
+            # Managers are created once and shared by all handlers below.
+            # The tab lists every audio file, so discovery must not filter by transcript.
+            transcript_manager = TranscriptManager()
+            audio_processor = AudioProcessor(sound_dir="Sound")
+            audio_processor.discover_audio_files(require_transcript=False)
+            initial_stats = transcript_manager.get_statistics()
             
             with gr.Row():
                 with gr.Column(scale=1):
-                    stats_display = gr.Markdown(
-                        f"""
-                        **Statistics:**
-                        - Total audio files: {initial_stats['total_audio_files']}
-                        - With transcript: {initial_stats['with_transcript']}
-                        - Without transcript: {initial_stats['without_transcript']}
-                        - Completion: {initial_stats['completion_percentage']:.1f}%
-                        """
-                    )
+                    stats_display = gr.Markdown(STATS_TEMPLATE.format(**initial_stats))
                     
                     refresh_stats_btn = gr.Button("🔄 Refresh Statistics", variant="secondary")
                     
@@ -308,17 +468,11 @@ def create_interface() -> gr.Blocks:
                             next_file_btn = gr.Button("➡️ Next File", variant="secondary")
                             prev_file_btn = gr.Button("⬅️ Previous File", variant="secondary")
                         
-                        def get_file_list() -> list:
-                            """Get fresh list of files without transcript."""
-                            tm, ap, _ = init_managers()
-                            return tm.get_audio_files_without_transcript(ap.audio_files)
-                        
                         def load_file_at_idx(idx: int, file_list: list) -> tuple:
                             """Load file at index from list."""
                             if 0 <= idx < len(file_list):
                                 file_path = Path(file_list[idx])
-                                tm, _, _ = init_managers()
-                                existing_transcript = tm.get_transcript(file_path) or ""
+                                existing_transcript = transcript_manager.get_transcript(file_path) or ""
                                 return (
                                     str(file_path),
                                     str(file_path),
@@ -330,33 +484,21 @@ def create_interface() -> gr.Blocks:
                         def save_and_next(file_path: str, transcript: str, current_idx: int, file_list: list) -> tuple:
                             """Save transcript and move to next file."""
                             try:
-                                tm, _, _ = init_managers()
-                                tm.set_transcript(file_path, transcript)
+                                transcript_manager.set_transcript(file_path, transcript)
                                 
-                                # Get updated file list
-                                ap = AudioProcessor(sound_dir="Sound")
-                                ap.discover_audio_files()
-                                updated_list = tm.get_audio_files_without_transcript(ap.audio_files)
-                                
-                                # Move to next if available
-                                if current_idx < len(file_list) - 1 and len(updated_list) > 0:
-                                    # File was removed from list, stay at same index or adjust
-                                    new_idx = min(current_idx, len(updated_list) - 1) if updated_list else 0
-                                    if new_idx < len(updated_list):
-                                        return load_file_at_idx(new_idx, updated_list) + (new_idx, updated_list, "✅ Transcript saved! Moving to next file...")
+                                # The saved file is the only one that changed, so drop it from the
+                                # session list instead of re-deriving the list from disk
+                                updated_list = [p for p in file_list if str(p) != file_path]
                                 
                                 # Refresh stats
-                                stats = tm.get_statistics()
-                                new_stats = f"""
-                                **Statistics:**
-                                - Total audio files: {stats['total_audio_files']}
-                                - With transcript: {stats['with_transcript']}
-                                - Without transcript: {stats['without_transcript']}
-                                - Completion: {stats['completion_percentage']:.1f}%
-                                """
+                                stats = transcript_manager.get_statistics()
+                                new_stats = STATS_TEMPLATE.format(**stats)
                                 
                                 if updated_list:
-                                    return load_file_at_idx(0, updated_list) + (0, updated_list, "✅ Transcript saved!", new_stats)
+                                    # The saved file dropped out of the list, so the same index
+                                    # now points at the next file (wrap around after the last one)
+                                    new_idx = current_idx if current_idx < len(updated_list) else 0
+                                    return load_file_at_idx(new_idx, updated_list) + (new_idx, updated_list, "✅ Transcript saved! Moving to next file...", new_stats)
                                 else:
                                     return "", "", "✅ All files have transcripts!", "", 0, [], "✅ Transcript saved! All files completed!", new_stats
                             except Exception as e:
@@ -404,8 +546,7 @@ def create_interface() -> gr.Blocks:
                     def export_dataset_fn() -> str:
                         """Export dataset to CSV."""
                         try:
-                            tm, _, _ = init_managers()
-                            output_path = tm.export_training_dataset()
+                            output_path = transcript_manager.export_training_dataset()
                             return f"✅ Dataset exported to: {output_path}"
                         except Exception as e:
                             return f"❌ Error: {str(e)}"
@@ -416,17 +557,19 @@ def create_interface() -> gr.Blocks:
                     )
                     
                     def refresh_stats_fn() -> tuple:
-                        """Refresh statistics and file list."""
-                        tm, ap, stats = init_managers()
-                        ap.discover_audio_files()
-                        file_list = tm.get_audio_files_without_transcript(ap.audio_files)
-                        stats_text = f"""
-                        **Statistics:**
-                        - Total audio files: {stats['total_audio_files']}
-                        - With transcript: {stats['with_transcript']}
-                        - Without transcript: {stats['without_transcript']}
-                        - Completion: {stats['completion_percentage']:.1f}%
+                        """Refresh statistics and file list.
+
+                        This is the deep refresh path: transcripts are re-read from disk to
+                        pick up external edits and the Sound directory is re-scanned.
                         """
+                        nonlocal transcript_manager
+                        transcript_manager = TranscriptManager()
+                        stats = transcript_manager.get_statistics()
+                        audio_processor.discover_audio_files(require_transcript=False)
+                        file_list = transcript_manager.get_audio_files_without_transcript(
+                            audio_processor.audio_files
+                        )
+                        stats_text = STATS_TEMPLATE.format(**stats)
                         return stats_text, file_list
                     
                     refresh_stats_btn.click(
@@ -439,31 +582,24 @@ def create_interface() -> gr.Blocks:
 
 def main() -> None:
     """Main entry point."""
-    import socket
-    
-    def find_free_port(start_port: int = 7860) -> int:
-        """Find a free port starting from start_port."""
-        for port in range(start_port, start_port + 10):
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind(("0.0.0.0", port))
-                    return port
-            except OSError:
-                continue
-        raise RuntimeError(f"Could not find free port in range {start_port}-{start_port + 9}")
-    
     logger.info("Starting Text-to-Speech Voice Cloning application")
 
-    # Find free port
-    port = find_free_port(7860)
-    if port != 7860:
-        logger.info(f"Port 7860 is in use, using port {port} instead")
+    # Load the model while Gradio binds the port so the first request hits a warm model
+    # (set TTS_PRELOAD=0 to defer loading to the first request)
+    if os.environ.get("TTS_PRELOAD", "1") == "1":
+        threading.Thread(
+            target=warm_up_voice_cloner, name="voice-cloner-warmup", daemon=True
+        ).start()
 
     # Create and launch interface
     app = create_interface()
+    # Bounded request queue so lightweight UI events never wait behind synthesis;
+    # the REST API is closed so all traffic goes through the queue
+    app.queue(default_concurrency_limit=4, max_size=16, api_open=False)
+    # No server_port: Gradio binds the first free port from 7860 (or
+    # GRADIO_SERVER_PORT) itself, so there is no probe-then-bind race
     app.launch(
         server_name="0.0.0.0",
-        server_port=port,
         share=False,
     )
 
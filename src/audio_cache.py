@@ -0,0 +1,191 @@
+"""Audio caching module for reusing synthesized audio across requests."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+
+class AudioCache:
+    """LRU cache of synthesized audio keyed by voice and input text, optionally persisted to disk."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_text_length: int = 1000,
+        cache_dir: Optional[str | Path] = None,
+        sample_rate: int = 22050,
+        max_disk_entries: int = 1024,
+    ) -> None:
+        """Initialize audio cache.
+
+        Args:
+            max_entries: Maximum number of audio arrays kept in memory
+            max_text_length: Texts longer than this are never cached (bounds memory)
+            cache_dir: Optional directory where entries are persisted as WAV files
+                so the cache stays warm across restarts
+            sample_rate: Sample rate used for persisted WAV files
+            max_disk_entries: Maximum number of persisted WAV files; the least
+                recently used ones are deleted beyond this
+        """
+        self.max_entries = max_entries
+        self.max_text_length = max_text_length
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.sample_rate = sample_rate
+        self.max_disk_entries = max_disk_entries
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, voice_id: str = "") -> str:
+        """Build the cache key for a text spoken by a voice.
+
+        Args:
+            text: Input text
+            voice_id: Identity of the model and speaker sample (see
+                VoiceCloner.get_voice_id)
+
+        Returns:
+            Hex digest identifying the voice and text
+        """
+        data = f"{voice_id}\0{text.strip()}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def is_cacheable(self, text: str) -> bool:
+        """Check whether a text is short enough to be cached.
+
+        Args:
+            text: Input text
+
+        Returns:
+            True if audio for this text may be cached
+        """
+        return len(text.strip()) <= self.max_text_length
+
+    def get(self, text: str, voice_id: str = "") -> Optional[np.ndarray]:
+        """Look up cached audio for a text.
+
+        The returned array is shared with the cache and must not be modified.
+
+        Args:
+            text: Input text
+            voice_id: Identity of the voice the audio must be spoken in
+
+        Returns:
+            Cached audio array, or None on a miss
+        """
+        if not self.is_cacheable(text):
+            return None
+
+        key = self.make_key(text, voice_id)
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                return audio
+
+        audio = self._load_from_disk(key)
+        if audio is not None:
+            self._remember(key, audio)
+        return audio
+
+    def put(self, text: str, audio: np.ndarray, voice_id: str = "") -> None:
+        """Store audio for a text.
+
+        Args:
+            text: Input text
+            audio: Synthesized audio array
+            voice_id: Identity of the voice the audio was spoken in
+        """
+        if not self.is_cacheable(text):
+            return
+
+        key = self.make_key(text, voice_id)
+        self._remember(key, audio)
+        self._save_to_disk(key, audio)
+
+    def __len__(self) -> int:
+        """Number of entries held in memory."""
+        return len(self._entries)
+
+    def _remember(self, key: str, audio: np.ndarray) -> None:
+        """Insert an entry in memory, evicting the least recently used one."""
+        with self._lock:
+            self._entries[key] = audio
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        """Get the WAV path for a key, or None when disk persistence is off."""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{key}.wav"
+
+    def _load_from_disk(self, key: str) -> Optional[np.ndarray]:
+        """Load a persisted entry if it exists, marking it as recently used."""
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            audio, _ = sf.read(str(path), dtype="float32")
+            os.utime(path)
+            return audio
+        except Exception as e:
+            logger.warning(f"Could not read cached audio {path}: {e}")
+            return None
+
+    def _save_to_disk(self, key: str, audio: np.ndarray) -> None:
+        """Persist an entry; failures only disable persistence for that entry.
+
+        The WAV is written to a temporary file and renamed into place, so a
+        concurrent reader or a crash never sees a partial file.
+        """
+        path = self._disk_path(key)
+        if path is None:
+            return
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.", suffix=".tmp")
+            os.close(fd)
+            sf.write(tmp_path, audio, self.sample_rate, format="WAV", subtype="FLOAT")
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except Exception as e:
+            logger.warning(f"Could not persist cached audio {path}: {e}")
+        finally:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Delete the least recently used WAV files beyond max_disk_entries."""
+        try:
+            entries = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".wav") and entry.is_file():
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+        except OSError as e:
+            logger.warning(f"Could not list audio cache {self.cache_dir}: {e}")
+            return
+
+        excess = len(entries) - self.max_disk_entries
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already removed by another process
@@ -1,12 +1,16 @@
 """Audio processing module for reading and normalizing audio files."""
 
+import json
 import logging
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
-import librosa
 import numpy as np
 import soundfile as sf
+import soxr
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +26,76 @@ except ImportError:
 TARGET_SAMPLE_RATE = 22050
 TARGET_DURATION_MAX = 30.0  # Maximum duration in seconds
 
+# Silence trimming frames (same defaults as librosa.effects.trim)
+TRIM_FRAME_LENGTH = 2048
+TRIM_HOP_LENGTH = 512
+
+# File that persists audio info across runs, relative to the sound directory. It
+# lives in the .cache subdirectory so saving it never changes the mtime of the
+# sound directory, which keys the directory-listing cache.
+AUDIO_INFO_CACHE_FILE = Path(".cache") / "audio_info.json"
+
+# Upper bound on concurrent header probes (sf.info releases the GIL)
+MAX_PROBE_WORKERS = 32
+
+# Slack applied to the size window used to skip probing files (headers, metadata)
+SIZE_FILTER_SLACK = 1.2
+
+# WAV format tags with a constant byte rate: PCM, IEEE float, extensible
+_CONSTANT_RATE_WAV_FORMATS = (0x0001, 0x0003, 0xFFFE)
+
+
+def to_pcm16(audio: np.ndarray) -> np.ndarray:
+    """Convert float audio in [-1, 1] to 16-bit PCM samples.
+
+    Uses the same scaling (x 32768, floor, clip) as libsndfile, so writing the
+    int16 buffer with subtype 'PCM_16' gives identical files while skipping
+    libsndfile's own per-sample float conversion.
+
+    Args:
+        audio: Float audio array
+
+    Returns:
+        int16 array; out-of-range samples are clipped
+    """
+    pcm = np.multiply(audio, np.float32(32768.0), dtype=np.float32)
+    np.floor(pcm, out=pcm)
+    np.clip(pcm, -32768.0, 32767.0, out=pcm)
+    return pcm.astype(np.int16)
+
+
+def _wav_byte_rate(path: Path) -> Optional[int]:
+    """Read the byte rate from a WAV file's fmt chunk without decoding it.
+
+    Args:
+        path: Path to a WAV file
+
+    Returns:
+        Bytes per second of audio, or None if the file is not an uncompressed
+        RIFF/WAVE file (its duration is then not linear in its size)
+    """
+    try:
+        with open(path, "rb") as f:
+            riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave != b"WAVE":
+                return None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id, chunk_size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    format_tag, _, _, byte_rate = struct.unpack("<HHII", f.read(12))
+                    if format_tag not in _CONSTANT_RATE_WAV_FORMATS or byte_rate <= 0:
+                        return None
+                    return byte_rate
+                if chunk_id == b"data":
+                    return None
+                # Chunks are word aligned
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    except (OSError, struct.error):
+        return None
+
 
 class AudioProcessor:
     """Process and normalize audio files for voice cloning."""
@@ -40,6 +114,15 @@ class AudioProcessor:
         self.sound_dir = Path(sound_dir)
         self.target_sample_rate = target_sample_rate
         self.audio_files: List[Path] = []
+        # Directory listing cached as (directory mtime_ns, sorted WAV paths)
+        self._scan_cache: Optional[Tuple[int, List[Path]]] = None
+        # get_audio_info() results keyed by path, stored with the file's mtime_ns
+        self._info_cache: Dict[str, Tuple[int, dict]] = {}
+        # WAV header byte rates read by the size filter, same keys and versioning;
+        # persisted with the audio info so rejected files are not re-read
+        self._byte_rate_cache: Dict[str, Tuple[int, Optional[int]]] = {}
+        self._info_cache_loaded = False
+        self._info_cache_dirty = False
 
     def discover_audio_files(self, require_transcript: bool = True) -> List[Path]:
         """Discover all WAV files in the sound directory.
@@ -54,8 +137,8 @@ class AudioProcessor:
             logger.warning(f"Sound directory {self.sound_dir} does not exist")
             return []
 
-        audio_files = list(self.sound_dir.glob("*.wav"))
-        audio_files = sorted(audio_files)
+        audio_files = self._scan_audio_files()
+        self._load_info_cache()
         
         # Filter by transcript if required
         if require_transcript and TRANSCRIPT_MANAGER_AVAILABLE:
@@ -70,6 +153,29 @@ class AudioProcessor:
         logger.info(f"Discovered {len(audio_files)} audio files")
         return self.audio_files
 
+    def _scan_audio_files(self) -> List[Path]:
+        """List WAV files in the sound directory, re-scanning only when it changed.
+
+        Adding, removing or renaming a file updates the directory mtime, so a single
+        stat is enough to tell whether the cached listing is still valid.
+
+        Returns:
+            Sorted list of WAV paths
+        """
+        mtime = self.sound_dir.stat().st_mtime_ns
+        if self._scan_cache is not None and self._scan_cache[0] == mtime:
+            return list(self._scan_cache[1])
+
+        # scandir returns the file type with each entry, so no per-file stat
+        with os.scandir(self.sound_dir) as entries:
+            audio_files = sorted(
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(".wav") and entry.is_file()
+            )
+        self._scan_cache = (mtime, audio_files)
+        return list(audio_files)
+
     def load_audio(
         self,
         audio_path: str | Path,
@@ -89,17 +195,27 @@ class AudioProcessor:
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
         try:
-            # Load audio with librosa (automatically resamples to target_sample_rate)
-            audio, sr = librosa.load(
-                str(audio_path),
-                sr=self.target_sample_rate,
-                duration=duration,
-                mono=True,
-            )
-
-            # Normalize audio to [-1, 1] range
-            if audio.max() > 0:
-                audio = audio / np.abs(audio).max()
+            # Decode straight to float32 with libsndfile
+            with sf.SoundFile(str(audio_path)) as f:
+                native_sr = f.samplerate
+                frames = int(duration * native_sr) if duration is not None else -1
+                audio = f.read(frames=frames, dtype="float32", always_2d=False)
+
+            # Downmix to mono
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1, dtype=np.float32)
+
+            # Resample to target_sample_rate (the soxr HQ resampler librosa.load uses)
+            sr = self.target_sample_rate
+            if native_sr != sr:
+                audio = soxr.resample(audio, native_sr, sr, quality="HQ").astype(
+                    np.float32, copy=False
+                )
+
+            # Normalize audio to [-1, 1] range (in place; the array is ours)
+            peak = max(audio.max(), -audio.min()) if audio.size else 0.0
+            if peak > 0:
+                np.multiply(audio, np.float32(1.0 / peak), out=audio)
 
             logger.debug(
                 f"Loaded audio: {audio_path.name}, "
@@ -123,12 +239,18 @@ class AudioProcessor:
         """
         audio_path = Path(audio_path)
         try:
+            key = str(audio_path)
+            mtime = audio_path.stat().st_mtime_ns
+            cached = self._info_cache.get(key)
+            if cached is not None and cached[0] == mtime:
+                return dict(cached[1])
+
             info = sf.info(str(audio_path))
             duration = info.duration
             sample_rate = info.samplerate
             channels = info.channels
 
-            return {
+            audio_info = {
                 "path": str(audio_path),
                 "duration": duration,
                 "sample_rate": sample_rate,
@@ -136,10 +258,64 @@ class AudioProcessor:
                 "format": info.format,
                 "subtype": info.subtype,
             }
+            self._info_cache[key] = (mtime, audio_info)
+            self._info_cache_dirty = True
+            return dict(audio_info)
         except Exception as e:
             logger.error(f"Error getting info for {audio_path}: {e}")
             raise
 
+    def _info_cache_path(self) -> Path:
+        """Get the path of the persisted audio info cache."""
+        return self.sound_dir / AUDIO_INFO_CACHE_FILE
+
+    def _load_info_cache(self) -> None:
+        """Load persisted audio info once; entries are re-validated by mtime on use."""
+        if self._info_cache_loaded:
+            return
+        self._info_cache_loaded = True
+
+        cache_path = self._info_cache_path()
+        if not cache_path.exists():
+            return
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                entries = json.load(f)
+            for key, entry in entries.items():
+                if "info" in entry:
+                    self._info_cache.setdefault(key, (entry["mtime_ns"], entry["info"]))
+                if "byte_rate" in entry:
+                    self._byte_rate_cache.setdefault(key, (entry["mtime_ns"], entry["byte_rate"]))
+            logger.debug(f"Loaded {len(entries)} cached audio info entries")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable audio info cache {cache_path}: {e}")
+
+    def save_info_cache(self) -> None:
+        """Persist audio info gathered since the last save."""
+        if not self._info_cache_dirty or not self.sound_dir.exists():
+            return
+
+        cache_path = self._info_cache_path()
+        entries = {
+            key: {"mtime_ns": mtime, "info": info}
+            for key, (mtime, info) in self._info_cache.items()
+        }
+        for key, (mtime, byte_rate) in self._byte_rate_cache.items():
+            entry = entries.get(key)
+            if entry is None or entry["mtime_ns"] < mtime:
+                entries[key] = {"mtime_ns": mtime, "byte_rate": byte_rate}
+            elif entry["mtime_ns"] == mtime:
+                entry["byte_rate"] = byte_rate
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, cache_path)
+            self._info_cache_dirty = False
+        except Exception as e:
+            logger.warning(f"Could not save audio info cache {cache_path}: {e}")
+
     def normalize_audio(self, audio: np.ndarray) -> np.ndarray:
         """Normalize audio array to [-1, 1] range.
 
@@ -152,9 +328,10 @@ class AudioProcessor:
         if len(audio) == 0:
             return audio
 
-        max_val = np.abs(audio).max()
-        if max_val > 0:
-            audio = audio / max_val
+        # Two fused reductions instead of materializing np.abs(audio)
+        peak = max(audio.max(), -audio.min())
+        if peak > 0:
+            audio = audio * (1.0 / peak)
 
         return audio
 
@@ -172,8 +349,26 @@ class AudioProcessor:
         Returns:
             Trimmed audio array
         """
-        trimmed, _ = librosa.effects.trim(audio, top_db=top_db)
-        return trimmed
+        if len(audio) == 0:
+            return audio
+
+        # Mean-square energy per centered frame, as librosa.feature.rms computes it
+        padded = np.pad(audio, TRIM_FRAME_LENGTH // 2)
+        frames = np.lib.stride_tricks.sliding_window_view(padded, TRIM_FRAME_LENGTH)
+        frames = frames[::TRIM_HOP_LENGTH]
+        energy = np.einsum("ij,ij->i", frames, frames) / TRIM_FRAME_LENGTH
+
+        # A frame is non-silent if it is within top_db of the loudest frame
+        # (compared in the power domain, with librosa's 1e-10 power floor)
+        amin = 1e-10
+        threshold = max(energy.max(), amin) * 10.0 ** (-top_db / 10.0)
+        non_silent = np.flatnonzero(np.maximum(energy, amin) > threshold)
+        if non_silent.size == 0:
+            return audio
+
+        start = non_silent[0] * TRIM_HOP_LENGTH
+        end = min(len(audio), (non_silent[-1] + 1) * TRIM_HOP_LENGTH)
+        return audio[start:end]
 
     def get_all_audio_info(self) -> List[dict]:
         """Get information for all discovered audio files.
@@ -184,15 +379,34 @@ class AudioProcessor:
         if not self.audio_files:
             self.discover_audio_files()
 
-        audio_info_list = []
-        for audio_file in self.audio_files:
+        infos = self._probe_audio_infos(self.audio_files)
+        audio_info_list = [info for info in infos if info is not None]
+
+        self.save_info_cache()
+        return audio_info_list
+
+    def _probe_audio_infos(self, audio_files: Sequence[Path]) -> List[Optional[dict]]:
+        """Get audio info for several files concurrently.
+
+        Args:
+            audio_files: Paths to probe
+
+        Returns:
+            Audio info per file in input order, None where probing failed
+        """
+        if not audio_files:
+            return []
+
+        def probe(audio_file: Path) -> Optional[dict]:
             try:
-                info = self.get_audio_info(audio_file)
-                audio_info_list.append(info)
+                return self.get_audio_info(audio_file)
             except Exception as e:
                 logger.warning(f"Skipping {audio_file}: {e}")
+                return None
 
-        return audio_info_list
+        max_workers = min(MAX_PROBE_WORKERS, len(audio_files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(probe, audio_files))
 
     def select_best_voice_samples(
         self,
@@ -213,21 +427,81 @@ class AudioProcessor:
         if not self.audio_files:
             self.discover_audio_files()
 
-        selected = []
-        for audio_file in self.audio_files:
-            try:
-                info = self.get_audio_info(audio_file)
-                duration = info["duration"]
+        candidates = self._filter_by_size(self.audio_files, min_duration, max_duration)
 
-                if min_duration <= duration <= max_duration:
+        # Probe in batches so selection can still stop early on large libraries
+        selected = []
+        batch_size = max(1, min(max_samples, MAX_PROBE_WORKERS))
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start : start + batch_size]
+            for audio_file, info in zip(batch, self._probe_audio_infos(batch)):
+                if info is not None and min_duration <= info["duration"] <= max_duration:
                     selected.append(audio_file)
+                    if len(selected) >= max_samples:
+                        break
+            if len(selected) >= max_samples:
+                break
 
-                if len(selected) >= max_samples:
-                    break
-
-            except Exception as e:
-                logger.debug(f"Skipping {audio_file} for selection: {e}")
-
+        self.save_info_cache()
         logger.info(f"Selected {len(selected)} voice samples")
         return selected
 
+    def _filter_by_size(
+        self,
+        audio_files: Sequence[Path],
+        min_duration: float,
+        max_duration: float,
+    ) -> List[Path]:
+        """Drop files whose size rules out a duration in range, without probing them.
+
+        Files whose info is already cached for their current mtime are judged by
+        the cached duration. For the others, WAV duration is linear in file size
+        for a fixed format, so each file's size is compared against the byte
+        rate from its own fmt chunk; files of mixed sample rates, channel counts
+        and sample formats are all judged correctly. Byte rates are cached per
+        file version like audio info, so warm runs open no files here. Files
+        without a readable constant-rate header are kept for probing. File order
+        is preserved because the first selected sample is the voice that gets
+        cloned.
+
+        Args:
+            audio_files: Candidate paths
+            min_duration: Minimum duration in seconds
+            max_duration: Maximum duration in seconds
+
+        Returns:
+            Paths that may fall within the duration range
+        """
+        candidates = []
+        for audio_file in audio_files:
+            try:
+                stat = audio_file.stat()
+            except OSError:
+                candidates.append(audio_file)
+                continue
+
+            key = str(audio_file)
+            cached = self._info_cache.get(key)
+            if cached is not None and cached[0] == stat.st_mtime_ns:
+                if min_duration <= cached[1]["duration"] <= max_duration:
+                    candidates.append(audio_file)
+                continue
+
+            cached_rate = self._byte_rate_cache.get(key)
+            if cached_rate is not None and cached_rate[0] == stat.st_mtime_ns:
+                byte_rate = cached_rate[1]
+            else:
+                byte_rate = _wav_byte_rate(audio_file)
+                self._byte_rate_cache[key] = (stat.st_mtime_ns, byte_rate)
+                self._info_cache_dirty = True
+
+            if byte_rate is None:
+                candidates.append(audio_file)
+                continue
+            min_size = min_duration * byte_rate / SIZE_FILTER_SLACK
+            max_size = max_duration * byte_rate * SIZE_FILTER_SLACK
+            if min_size <= stat.st_size <= max_size:
+                candidates.append(audio_file)
+
+        logger.debug(f"Size filter kept {len(candidates)}/{len(audio_files)} files")
+        return candidates
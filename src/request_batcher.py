@@ -0,0 +1,163 @@
+"""Request batching module that coalesces concurrent synthesis requests.
+
+Batching does not make synthesis itself faster: XTTS has no batched decoder, so
+a batch is still decoded one text at a time under the engine lock. The gains are
+that identical texts submitted together are synthesized once, and that one
+voice-sample lookup is shared by every request in a window. When the server is
+idle a request is dispatched immediately instead of waiting for the window.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RequestBatcher(Generic[T]):
+    """Coalesce requests arriving within a short window into one batched call."""
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[str]], Iterable[T | BaseException]],
+        max_batch_size: int = 4,
+        batch_window_ms: float = 20.0,
+    ) -> None:
+        """Initialize request batcher.
+
+        Args:
+            process_batch: Blocking function mapping a list of texts to their
+                results in the same order. It may return a generator, in which case
+                each request is resolved as soon as its own result is yielded. A
+                result may be an exception instance, which is raised only for the
+                request(s) that submitted that text.
+            max_batch_size: Maximum number of requests drained into one batch
+            batch_window_ms: How long to wait for more requests after the first one
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, text: str) -> T:
+        """Submit a text and wait for its result.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Result produced by process_batch for this text
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        """Start the background worker on the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Drain the queue into batches forever."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+
+            # Only wait for more requests when others are already queued; an idle
+            # server dispatches the first request straight away
+            if self._queue.empty():
+                deadline = loop.time()
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Process one batch off the event loop and resolve its futures.
+
+        Args:
+            batch: List of (text, future) pairs
+        """
+        # Identical texts in the same batch are only processed once
+        futures_by_text: Dict[str, List[asyncio.Future]] = {}
+        for text, future in batch:
+            futures_by_text.setdefault(text, []).append(future)
+        texts = list(futures_by_text)
+        logger.debug(f"Processing batch of {len(batch)} requests ({len(texts)} unique)")
+
+        try:
+            await asyncio.to_thread(
+                self._process, texts, futures_by_text, asyncio.get_running_loop()
+            )
+        except Exception as e:
+            self._fail([future for _, future in batch], e)
+
+    def _process(
+        self,
+        texts: List[str],
+        futures_by_text: Dict[str, List[asyncio.Future]],
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """Run process_batch in a worker thread, resolving futures as results arrive.
+
+        Args:
+            texts: Unique texts of the batch
+            futures_by_text: Futures waiting on each text
+            loop: Event loop owning the futures
+        """
+        results = self.process_batch(texts)
+        if hasattr(results, "__len__") and len(results) != len(texts):
+            raise RuntimeError(
+                f"process_batch returned {len(results)} results for {len(texts)} texts"
+            )
+
+        count = 0
+        for text, result in zip(texts, results):
+            loop.call_soon_threadsafe(self._resolve, futures_by_text[text], result)
+            count += 1
+
+        if count != len(texts):
+            error = RuntimeError(f"process_batch returned {count} results for {len(texts)} texts")
+            for text in texts[count:]:
+                loop.call_soon_threadsafe(self._fail, futures_by_text[text], error)
+
+    @staticmethod
+    def _resolve(futures: List[asyncio.Future], result: T | BaseException) -> None:
+        """Deliver one result to every request that submitted its text.
+
+        Args:
+            futures: Futures waiting on the text
+            result: Result or exception instance
+        """
+        if isinstance(result, BaseException):
+            RequestBatcher._fail(futures, result)
+            return
+        for future in futures:
+            if not future.done():  # Caller may have gone away
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(futures: List[asyncio.Future], error: BaseException) -> None:
+        """Set an exception on every still-pending future.
+
+        Args:
+            futures: Futures to fail
+            error: Exception to raise in the waiting requests
+        """
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
@@ -1,32 +1,67 @@
 """Text processing module for English text normalization and tokenization."""
 
+import functools
 import logging
 import re
-from typing import List
-
-try:
-    from underthesea import word_tokenize
-except ImportError:
-    logging.warning("underthesea not available, using simple tokenizer")
-    word_tokenize = None
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns shared by all TextProcessor instances
+_WHITESPACE_RE = re.compile(r"\s+")
+_SPECIAL_CHARS_RE = re.compile(r"[^\w\s.,!?;:()\-'\"\"]")
+_SENTENCE_END_RE = re.compile(r"[.!?]+(?=\s|$)")
+_WORD_RE = re.compile(r"\w+(?:['-]\w+)*|[.,!?;:]")
+
+# Number of recent preprocess_for_tts results kept per TextProcessor
+CHUNK_CACHE_SIZE = 64
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_abbreviations(
+    abbreviations: Tuple[Tuple[str, str], ...],
+) -> Tuple[Dict[str, str], "re.Pattern[str]"]:
+    """Build the abbreviation lookup and matcher once per abbreviation set.
+
+    Args:
+        abbreviations: (abbreviation, expansion) pairs
+
+    Returns:
+        Tuple of (lowercased lookup, compiled alternation matching any abbreviation)
+    """
+    lookup = {k.lower(): v for k, v in abbreviations}
+    # One alternation over all abbreviations (longest first), matched once per call
+    alternation = "|".join(
+        re.escape(k) for k in sorted((k for k, _ in abbreviations), key=len, reverse=True)
+    )
+    return lookup, re.compile(r"\b(" + alternation + r")\b", re.IGNORECASE)
+
 
 class TextProcessor:
     """Process and normalize English text for TTS."""
 
+    # Common abbreviations in English
+    ABBREVIATIONS = {
+        "Dr.": "Doctor",
+        "Mr.": "Mister",
+        "Mrs.": "Missus",
+        "Ms.": "Miss",
+        "Prof.": "Professor",
+        "vs.": "versus",
+    }
+
     def __init__(self) -> None:
         """Initialize text processor."""
-        # Common abbreviations in English
-        self.abbreviations = {
-            "Dr.": "Doctor",
-            "Mr.": "Mister",
-            "Mrs.": "Missus",
-            "Ms.": "Miss",
-            "Prof.": "Professor",
-            "vs.": "versus",
-        }
+        self.abbreviations = dict(self.ABBREVIATIONS)
+        self._abbreviation_lookup, self._abbreviation_re = _compile_abbreviations(
+            tuple(self.abbreviations.items())
+        )
+
+        # LRU of (text, max_length) -> chunks; requests run on several threads
+        self._chunk_cache: OrderedDict[Tuple[str, int], List[str]] = OrderedDict()
+        self._chunk_cache_lock = threading.Lock()
 
     def normalize_text(self, text: str) -> str:
         """Normalize English text for TTS.
@@ -41,7 +76,7 @@ class TextProcessor:
             return ""
 
         # Remove extra whitespace
-        text = re.sub(r"\s+", " ", text.strip())
+        text = _WHITESPACE_RE.sub(" ", text.strip())
 
         # Normalize Vietnamese diacritics (if needed)
         text = self._normalize_diacritics(text)
@@ -75,11 +110,9 @@ class TextProcessor:
         Returns:
             Text with expanded abbreviations
         """
-        for abbrev, expansion in self.abbreviations.items():
-            # Use word boundaries to match whole words
-            pattern = r"\b" + re.escape(abbrev) + r"\b"
-            text = re.sub(pattern, expansion, text, flags=re.IGNORECASE)
-        return text
+        return self._abbreviation_re.sub(
+            lambda m: self._abbreviation_lookup[m.group(0).lower()], text
+        )
 
     def _clean_special_chars(self, text: str) -> str:
         """Clean special characters that might cause TTS issues.
@@ -91,12 +124,7 @@ class TextProcessor:
             Cleaned text
         """
         # Keep English characters, numbers, basic punctuation
-        text = re.sub(
-            r"[^\w\s.,!?;:()\-'\"\"]",
-            "",
-            text,
-        )
-        return text
+        return _SPECIAL_CHARS_RE.sub("", text)
 
     def tokenize(self, text: str) -> List[str]:
         """Tokenize English text.
@@ -110,17 +138,8 @@ class TextProcessor:
         if not text:
             return []
 
-        normalized = self.normalize_text(text)
-
-        if word_tokenize is not None:
-            try:
-                tokens = word_tokenize(normalized)
-                return [token for token in tokens if token.strip()]
-            except Exception as e:
-                logger.warning(f"Error in underthesea tokenization: {e}")
-
-        # Fallback to simple whitespace tokenization
-        return [token for token in normalized.split() if token.strip()]
+        # Words (with inner apostrophes/hyphens) and punctuation marks
+        return _WORD_RE.findall(self.normalize_text(text))
 
     def split_sentences(self, text: str) -> List[str]:
         """Split text into sentences.
@@ -134,54 +153,130 @@ class TextProcessor:
         if not text:
             return []
 
-        # Split by sentence-ending punctuation
-        sentences = re.split(r"[.!?]+\s+", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        return list(self._iter_sentences(text))
+
+    @staticmethod
+    def _split_by_length(text: str, max_length: int) -> List[str]:
+        """Split text into pieces of at most max_length, preferring word boundaries.
+
+        Args:
+            text: Text without sentence boundaries
+            max_length: Maximum length per piece (characters)
 
-        return sentences
+        Returns:
+            List of pieces
+        """
+        pieces = []
+        while len(text) > max_length:
+            cut = text.rfind(" ", 0, max_length + 1)
+            if cut <= 0:
+                cut = max_length
+            pieces.append(text[:cut].rstrip())
+            text = text[cut:].lstrip()
+        if text:
+            pieces.append(text)
+        return pieces
+
+    def _iter_sentences(self, text: str) -> Iterator[str]:
+        """Yield sentences, keeping their ending punctuation.
+
+        Args:
+            text: Input text
 
-    def preprocess_for_tts(self, text: str, max_length: int = 500) -> List[str]:
+        Yields:
+            Non-empty sentences in order
+        """
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(text):
+            sentence = text[start : match.end()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+
+        # Trailing text without closing punctuation
+        sentence = text[start:].strip()
+        if sentence:
+            yield sentence
+
+    def preprocess_for_tts(
+        self,
+        text: str,
+        max_length: int = 500,
+        max_sentence_length: Optional[int] = None,
+    ) -> List[str]:
         """Preprocess text for TTS input.
 
         Args:
             text: Input text
             max_length: Maximum length per chunk (characters)
+            max_sentence_length: Sentences longer than this are split into
+                chunks of their own; defaults to max_length
 
         Returns:
             List of text chunks ready for TTS
         """
+        if max_sentence_length is None:
+            max_sentence_length = max_length
+        max_sentence_length = min(max_sentence_length, max_length)
+
+        key = (text, max_length, max_sentence_length)
+        with self._chunk_cache_lock:
+            chunks = self._chunk_cache.get(key)
+            if chunks is not None:
+                self._chunk_cache.move_to_end(key)
+                return list(chunks)
+
+        chunks = self._chunk_text(text, max_length, max_sentence_length)
+
+        with self._chunk_cache_lock:
+            self._chunk_cache[key] = chunks
+            while len(self._chunk_cache) > CHUNK_CACHE_SIZE:
+                self._chunk_cache.popitem(last=False)
+        return list(chunks)
+
+    def _chunk_text(self, text: str, max_length: int, max_sentence_length: int) -> List[str]:
+        """Normalize text and group its sentences into chunks of at most max_length.
+
+        Args:
+            text: Input text
+            max_length: Maximum length per chunk (characters)
+            max_sentence_length: Sentences longer than this are split into
+                chunks of their own (at most max_length)
+
+        Returns:
+            List of text chunks
+        """
         normalized = self.normalize_text(text)
 
-        if len(normalized) <= max_length:
+        if len(normalized) <= max_sentence_length:
             return [normalized]
 
-        # Split into sentences first
-        sentences = self.split_sentences(normalized)
-        if not sentences:
-            # If no sentence breaks, split by length
-            chunks = [
-                normalized[i : i + max_length]
-                for i in range(0, len(normalized), max_length)
-            ]
-            return chunks
-
-        # Group sentences into chunks
+        # Group sentences into chunks; parts are joined once per chunk.
+        # Sentences keep their punctuation, so a space is the only separator.
         chunks = []
-        current_chunk = ""
-
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) + 1 <= max_length:
-                if current_chunk:
-                    current_chunk += ". " + sentence
-                else:
-                    current_chunk = sentence
+        current_parts: List[str] = []
+        current_len = 0
+
+        for sentence in self._iter_sentences(normalized):
+            # An overlong sentence is split by length into chunks of its own, so
+            # the pieces are never regrouped into one sentence downstream
+            if len(sentence) > max_sentence_length:
+                if current_parts:
+                    chunks.append(" ".join(current_parts))
+                    current_parts, current_len = [], 0
+                chunks.extend(self._split_by_length(sentence, max_sentence_length))
+                continue
+
+            added_len = len(sentence) + 1 if current_parts else len(sentence)
+            if current_len + added_len <= max_length:
+                current_parts.append(sentence)
+                current_len += added_len
             else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = sentence
+                chunks.append(" ".join(current_parts))
+                current_parts = [sentence]
+                current_len = len(sentence)
 
-        if current_chunk:
-            chunks.append(current_chunk)
+        if current_parts:
+            chunks.append(" ".join(current_parts))
 
         return chunks
-
@@ -1,36 +1,202 @@
 """TTS engine module using Coqui TTS with voice cloning support."""
 
+import contextlib
+import functools
+import hashlib
 import logging
 import os
-import sys
+import platform
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
+import soundfile as sf
 import torch
 
-# Workaround for bnnumerizer import issue
-# Try to install bnnumerizer if not available
 try:
-    import bnnumerizer
-except ImportError:
-    logging.warning("bnnumerizer not found, attempting to install...")
-    import subprocess
-    try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "bnnumerizer", "--quiet"])
-        import bnnumerizer
-    except Exception as e:
-        logging.warning(f"Could not install bnnumerizer: {e}")
-        # Continue anyway - may work if Bangla phonemizer is not used
+    from TTS.api import TTS
+    from TTS.utils.generic_utils import get_user_data_dir
+except ImportError as e:
+    # Coqui TTS imports bnnumerizer (Bangla numerals) unconditionally
+    if e.name != "bnnumerizer":
+        raise
+    raise ImportError(
+        "Coqui TTS requires bnnumerizer: run `pip install bnnumerizer`. If it will not "
+        "install, create a stub site-packages/bnnumerizer.py containing "
+        "`def numerize(text): return text` (see README)."
+    ) from e
 
-from TTS.api import TTS
+from src.audio_processor import to_pcm16
 
 logger = logging.getLogger(__name__)
 
-# Force CPU usage and optimize for CPU
+# Opt-in torch.compile of the vocoder (TTS_COMPILE=1); compiled kernels are
+# cached on disk so later runs skip most of the compilation
+COMPILE_CACHE_DIR = Path.home() / ".cache" / "narrator_sound" / "inductor"
+
+# Speaker latents kept in memory per engine (one entry per speaker sample version)
+LATENTS_MEMORY_CACHE_SIZE = 8
+
+# Force CPU usage
 os.environ["CUDA_VISIBLE_DEVICES"] = ""
-# Optimize CPU inference
-torch.set_num_threads(4)  # Limit threads to avoid overloading
+
+
+def _env_num_threads() -> Optional[int]:
+    """Read the CPU thread count from the TTS_NUM_THREADS environment variable.
+
+    Returns:
+        Positive thread count, or None when unset or invalid (PyTorch's default
+        is then kept)
+    """
+    value = os.environ.get("TTS_NUM_THREADS", "").strip()
+    if not value:
+        return None
+    try:
+        threads = int(value)
+    except ValueError:
+        threads = 0
+    if threads <= 0:
+        logger.warning(
+            f"Ignoring TTS_NUM_THREADS={value!r}: expected a positive integer, "
+            "keeping PyTorch's default"
+        )
+        return None
+    return threads
+
+
+def _prefetch_model_files(model_name: str) -> None:
+    """Ask the kernel to start reading a downloaded model into the page cache.
+
+    The checkpoint is then read from memory instead of disk when TTS loads it,
+    overlapping disk I/O with Python-side model construction. This is a hint
+    only: platforms without posix_fadvise and missing models are skipped.
+
+    Args:
+        model_name: Coqui model name (e.g. 'tts_models/multilingual/multi-dataset/xtts_v2')
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    model_dir = Path(get_user_data_dir("tts")) / model_name.replace("/", "--")
+    if not model_dir.is_dir():
+        return
+
+    for path in model_dir.iterdir():
+        if not path.is_file():
+            continue
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"Could not prefetch {path}: {e}")
+
+
+@functools.lru_cache(maxsize=2)
+def _get_tts(model_name: str, device: str, quantize: bool = False) -> TTS:
+    """Load a TTS model once per process and share it between engines.
+
+    Args:
+        model_name: Name of the TTS model to load
+        device: Device to move the model to
+        quantize: Apply int8 dynamic quantization (CPU only)
+
+    Returns:
+        Loaded TTS instance
+    """
+    _prefetch_model_files(model_name)
+    tts = TTS(model_name=model_name, progress_bar=False)
+    tts.to(device)
+    if quantize:
+        _quantize_model(tts, device)
+    if os.environ.get("TTS_COMPILE", "0") == "1":
+        _compile_vocoder(tts)
+    return tts
+
+
+def _quantize_model(tts: TTS, device: str) -> None:
+    """Convert the model's Linear layers to int8 dynamic quantization in place.
+
+    Weights are stored as int8 and activations are quantized on the fly, which
+    speeds up CPU matmuls and halves their memory traffic. Output can differ
+    slightly from the FP32 model.
+
+    Args:
+        tts: Loaded TTS instance
+        device: Device the model runs on
+    """
+    if device != "cpu":
+        logger.warning(f"Dynamic quantization is CPU-only; skipping it on {device}")
+        return
+
+    # fbgemm targets x86, qnnpack targets ARM
+    is_arm = platform.machine().lower() in ("arm64", "aarch64")
+    engine = "qnnpack" if is_arm else "fbgemm"
+    if engine in torch.backends.quantized.supported_engines:
+        torch.backends.quantized.engine = engine
+
+    model = tts.synthesizer.tts_model
+    torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+    logger.info(f"Applied int8 dynamic quantization ({torch.backends.quantized.engine})")
+
+
+def _compile_vocoder(tts: TTS) -> None:
+    """Compile the XTTS HiFi-GAN decoder with torch.compile.
+
+    Only the decoder is compiled: torch.compile wraps forward(), and XTTS runs
+    inference through its own methods, while the decoder is called as a module.
+    Failures leave the eager decoder in place.
+
+    Args:
+        tts: Loaded TTS instance
+    """
+    model = tts.synthesizer.tts_model
+    decoder = getattr(model, "hifigan_decoder", None)
+    if decoder is None or not hasattr(torch, "compile"):
+        logger.warning("torch.compile requested but not supported for this model")
+        return
+
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(COMPILE_CACHE_DIR))
+    try:
+        model.hifigan_decoder = torch.compile(decoder, dynamic=True)
+        logger.info("Compiled vocoder with torch.compile")
+    except Exception as e:
+        logger.warning(f"torch.compile failed, using eager vocoder: {e}")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_model_lock(model_name: str, device: str) -> threading.Lock:
+    """Get the lock serializing calls into the shared model for (model_name, device).
+
+    Args:
+        model_name: Name of the TTS model
+        device: Device the model runs on
+
+    Returns:
+        Lock shared by every engine using that model
+    """
+    return threading.Lock()
+
+
+def _load_latents(path: Path) -> dict:
+    """Load cached conditioning latents, memory-mapping the file when supported.
+
+    Args:
+        path: Path to a file written by torch.save
+
+    Returns:
+        Dictionary of tensors
+    """
+    try:
+        return torch.load(str(path), map_location="cpu", mmap=True, weights_only=True)
+    except TypeError:
+        # PyTorch < 2.1 has no mmap support
+        return torch.load(str(path), map_location="cpu")
 
 
 class TTSEngine:
@@ -40,19 +206,44 @@ class TTSEngine:
         self,
         model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2",
         device: Optional[str] = None,
+        half_precision: bool = False,
+        threads: Optional[int] = None,
+        quantize: bool = False,
     ) -> None:
         """Initialize TTS engine.
 
         Args:
             model_name: Name of the TTS model to use
             device: Device to use ('cpu' or 'cuda'). If None, auto-detect.
+            half_precision: Run inference under BF16 autocast. Weights stay in FP32,
+                so numerically sensitive ops (e.g. the vocoder) keep full precision.
+            threads: PyTorch intra-op CPU threads. If None, the TTS_NUM_THREADS
+                environment variable is used, else PyTorch's default is kept.
+                Use 4 for single-instance latency and 2 per instance when running
+                three or more instances on one machine.
+            quantize: Quantize Linear layers to int8 (CPU only). Faster CPU
+                inference at a small quality cost; validate on a reference clip.
         """
         if device is None:
             device = "cpu"  # Force CPU for this project
 
+        if threads is None:
+            threads = _env_num_threads()
+        if threads is not None:
+            torch.set_num_threads(threads)
+
         self.device = device
         self.model_name = model_name
+        self.half_precision = half_precision
+        self.quantize = quantize
         self.tts: Optional[TTS] = None
+        # The model is not reentrant and is shared by engines with the same
+        # (model_name, device): concurrent requests take turns per model call
+        self._model_lock = _get_model_lock(model_name, device)
+        # In-memory latents keyed by (resolved path, mtime_ns, cache_dir)
+        self._cached_latents = functools.lru_cache(maxsize=LATENTS_MEMORY_CACHE_SIZE)(
+            self._load_or_compute_latents
+        )
         self._initialize_model()
 
     def _initialize_model(self) -> None:
@@ -61,8 +252,7 @@ class TTSEngine:
             logger.info(f"Initializing TTS model: {self.model_name}")
             logger.info(f"Using device: {self.device}")
 
-            self.tts = TTS(model_name=self.model_name, progress_bar=True)
-            self.tts.to(self.device)
+            self.tts = _get_tts(self.model_name, self.device, self.quantize)
 
             logger.info("TTS model initialized successfully")
         except Exception as e:
@@ -85,7 +275,7 @@ class TTSEngine:
             output_path: Optional path to save output audio
 
         Returns:
-            Audio array as numpy array
+            Mono float32 audio array
         """
         if self.tts is None:
             raise RuntimeError("TTS model not initialized")
@@ -94,51 +284,41 @@ class TTSEngine:
             raise ValueError("Text cannot be empty")
 
         try:
-            # Use temporary output path if not provided
-            if output_path is None:
-                output_path = Path("temp_output.wav")
-            else:
-                output_path = Path(output_path)
-
-            # Synthesize speech
-            if speaker_wav is not None:
-                # Voice cloning mode
-                logger.info(f"Synthesizing with voice cloning from {speaker_wav}")
-                self.tts.tts_to_file(
-                    text=text,
-                    speaker_wav=str(speaker_wav),
-                    language=language,
-                    file_path=str(output_path),
-                )
-            else:
-                # Standard TTS mode
-                logger.info("Synthesizing without voice cloning")
-                self.tts.tts_to_file(
-                    text=text,
-                    language=language,
-                    file_path=str(output_path),
-                )
+            # Synthesize speech in memory; a file is only written when asked for
+            with self._model_lock, torch.inference_mode(), self._autocast():
+                if speaker_wav is not None:
+                    # Voice cloning mode
+                    logger.info(f"Synthesizing with voice cloning from {speaker_wav}")
+                    wav = self.tts.tts(
+                        text=text,
+                        speaker_wav=str(speaker_wav),
+                        language=language,
+                        split_sentences=True,
+                    )
+                else:
+                    # Standard TTS mode
+                    logger.info("Synthesizing without voice cloning")
+                    wav = self.tts.tts(
+                        text=text,
+                        language=language,
+                        split_sentences=True,
+                    )
 
-            # Load the generated audio
-            import soundfile as sf
+            audio = np.asarray(wav, dtype=np.float32)
 
-            audio, sample_rate = sf.read(str(output_path))
-            
-            # Ensure audio is 1D array (mono)
+            # Ensure audio is 1D array (mono); channels are the shorter axis
             if audio.ndim > 1:
-                audio = np.mean(audio, axis=0)
-            
-            # Ensure proper dtype
-            audio = audio.astype(np.float32)
-            
+                channel_axis = audio.shape.index(min(audio.shape))
+                audio = audio.mean(axis=channel_axis, dtype=np.float32)
+
             # Normalize to prevent clipping
-            max_val = np.abs(audio).max()
+            max_val = np.abs(audio).max() if len(audio) else 0.0
             if max_val > 0:
                 audio = audio / max_val * 0.95  # Leave headroom
 
-            # Clean up temp file if it was auto-created
-            if output_path.name == "temp_output.wav" and output_path.exists():
-                output_path.unlink()
+            sample_rate = self.tts.synthesizer.output_sample_rate
+            if output_path is not None:
+                sf.write(str(output_path), to_pcm16(audio), sample_rate, subtype="PCM_16")
 
             logger.info(f"Successfully synthesized {len(audio) / sample_rate:.2f}s of audio")
             return audio
@@ -147,6 +327,171 @@ class TTSEngine:
             logger.error(f"Error synthesizing speech: {e}")
             raise
 
+    def get_conditioning_latents(
+        self,
+        speaker_wav: str | Path,
+        cache_dir: Optional[str | Path] = None,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Compute XTTS conditioning latents for a speaker sample.
+
+        Latents are memoized in memory per sample version, so repeated requests for
+        the same speaker skip hashing the file and reading the disk cache. The
+        returned tensors are shared and must not be modified.
+
+        Args:
+            speaker_wav: Path to speaker reference audio file
+            cache_dir: Optional directory for cached latents. Files are named after
+                the SHA-1 of the audio bytes, so edited samples are re-encoded.
+
+        Returns:
+            Tuple of (gpt_cond_latent, speaker_embedding)
+        """
+        if self.tts is None:
+            raise RuntimeError("TTS model not initialized")
+
+        speaker_wav = Path(speaker_wav).resolve()
+        mtime_ns = speaker_wav.stat().st_mtime_ns
+        return self._cached_latents(
+            speaker_wav, mtime_ns, Path(cache_dir) if cache_dir is not None else None
+        )
+
+    def _load_or_compute_latents(
+        self,
+        speaker_wav: Path,
+        mtime_ns: int,
+        cache_dir: Optional[Path],
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Load latents from the disk cache or compute them with the model.
+
+        Args:
+            speaker_wav: Resolved path to speaker reference audio file
+            mtime_ns: Modification time of speaker_wav (only part of the memo key)
+            cache_dir: Optional directory for cached latents
+
+        Returns:
+            Tuple of (gpt_cond_latent, speaker_embedding)
+        """
+        cache_path = None
+        if cache_dir is not None:
+            digest = hashlib.sha1(speaker_wav.read_bytes()).hexdigest()
+            cache_path = Path(cache_dir) / f"{digest}.pt"
+            if cache_path.exists():
+                try:
+                    latents = _load_latents(cache_path)
+                    logger.info(f"Loaded cached conditioning latents for {speaker_wav.name}")
+                    return (
+                        latents["gpt_cond_latent"].to(self.device),
+                        latents["speaker_embedding"].to(self.device),
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not load cached latents {cache_path}: {e}")
+
+        logger.info(f"Computing conditioning latents for {speaker_wav.name}")
+        model = self.tts.synthesizer.tts_model
+        config = model.config
+        with self._model_lock, torch.inference_mode():
+            gpt_cond_latent, speaker_embedding = model.get_conditioning_latents(
+                audio_path=[str(speaker_wav)],
+                gpt_cond_len=config.gpt_cond_len,
+                gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+                max_ref_length=config.max_ref_len,
+                sound_norm_refs=config.sound_norm_refs,
+            )
+
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                torch.save(
+                    {
+                        "gpt_cond_latent": gpt_cond_latent.cpu(),
+                        "speaker_embedding": speaker_embedding.cpu(),
+                    },
+                    str(cache_path),
+                )
+            except Exception as e:
+                logger.warning(f"Could not cache latents to {cache_path}: {e}")
+
+        return gpt_cond_latent, speaker_embedding
+
+    def synthesize_with_latents(
+        self,
+        text: str,
+        gpt_cond_latent: torch.Tensor,
+        speaker_embedding: torch.Tensor,
+        language: str = "en",
+    ) -> np.ndarray:
+        """Synthesize speech from precomputed conditioning latents.
+
+        Mirrors what tts() does for XTTS (sentence splitting, the model's
+        sampling settings, silence after each sentence) without re-encoding the
+        speaker sample or writing a file.
+
+        Args:
+            text: Input text to synthesize
+            gpt_cond_latent: GPT conditioning latent from get_conditioning_latents()
+            speaker_embedding: Speaker embedding from get_conditioning_latents()
+            language: Language code
+
+        Returns:
+            Mono float32 audio array
+        """
+        if self.tts is None:
+            raise RuntimeError("TTS model not initialized")
+
+        if not text:
+            raise ValueError("Text cannot be empty")
+
+        try:
+            model = self.tts.synthesizer.tts_model
+            config = model.config
+            sentence_gap = np.zeros(10000, dtype=np.float32)  # Same gap as TTS.api
+
+            segments = []
+            with self._model_lock, torch.inference_mode(), self._autocast():
+                for sentence in self.tts.synthesizer.split_into_sentences(text):
+                    outputs = model.inference(
+                        text=sentence,
+                        language=language,
+                        gpt_cond_latent=gpt_cond_latent,
+                        speaker_embedding=speaker_embedding,
+                        temperature=config.temperature,
+                        length_penalty=config.length_penalty,
+                        repetition_penalty=config.repetition_penalty,
+                        top_k=config.top_k,
+                        top_p=config.top_p,
+                    )
+                    wav = outputs["wav"]
+                    if isinstance(wav, torch.Tensor):
+                        wav = wav.detach().float().cpu().numpy()
+                    segments.append(np.asarray(wav, dtype=np.float32).reshape(-1))
+                    segments.append(sentence_gap)
+
+            audio = np.concatenate(segments) if segments else np.zeros(0, dtype=np.float32)
+
+            # Normalize to prevent clipping
+            max_val = np.abs(audio).max() if len(audio) else 0.0
+            if max_val > 0:
+                audio = audio / max_val * 0.95  # Leave headroom
+
+            sample_rate = self.tts.synthesizer.output_sample_rate
+            logger.info(f"Successfully synthesized {len(audio) / sample_rate:.2f}s of audio")
+            return audio
+
+        except Exception as e:
+            logger.error(f"Error synthesizing speech: {e}")
+            raise
+
+    def _autocast(self) -> contextlib.AbstractContextManager:
+        """Get the autocast context used around model inference.
+
+        Returns:
+            BF16 autocast context if half precision is enabled, else a no-op context
+        """
+        if not self.half_precision:
+            return contextlib.nullcontext()
+        device_type = "cuda" if str(self.device).startswith("cuda") else "cpu"
+        return torch.autocast(device_type=device_type, dtype=torch.bfloat16)
+
     def is_available(self) -> bool:
         """Check if TTS engine is available.
 
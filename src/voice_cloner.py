@@ -1,19 +1,38 @@
 """Voice cloning module that combines audio processing and TTS."""
 
 import logging
-import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
+import soundfile as sf
+import torch
 
-from src.audio_processor import AudioProcessor
+from src.audio_processor import AudioProcessor, to_pcm16
 from src.audio_deepener import deepen_voice
 from src.text_processor import TextProcessor
 from src.tts_engine import TTSEngine
 
 logger = logging.getLogger(__name__)
 
+# Sample rate of the audio returned by VoiceCloner (XTTS standard sample rate)
+OUTPUT_SAMPLE_RATE = 22050
+
+# Maximum characters per streamed text chunk, and per sentence sent to the model
+# (XTTS rejects sentences above its ~400 token limit)
+CHUNK_MAX_LENGTH = 500
+
+# Maximum characters per clone_voice() model call. The engine splits sentences
+# itself, so grouping sentences saves per-call overhead and inter-chunk pauses;
+# a single sentence longer than CHUNK_MAX_LENGTH is still split before the call.
+SINGLE_CALL_LIMIT = 2000
+
+# Silence inserted between chunks (seconds)
+PAUSE_DURATION = 0.2
+
+# Pitch shift applied by the deep voice processing (semitones)
+DEEPEN_PITCH_SHIFT = -1.2
+
 
 class VoiceCloner:
     """Voice cloning system using audio samples and TTS."""
@@ -23,6 +42,9 @@ class VoiceCloner:
         sound_dir: str | Path = "Sound",
         model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2",
         device: str = "cpu",
+        half_precision: bool = False,
+        threads: Optional[int] = None,
+        quantize: bool = False,
     ) -> None:
         """Initialize voice cloner.
 
@@ -30,13 +52,27 @@ class VoiceCloner:
             sound_dir: Directory containing audio samples
             model_name: TTS model name
             device: Device to use ('cpu' or 'cuda')
+            half_precision: Run TTS inference under BF16 autocast
+            threads: PyTorch CPU threads (see TTSEngine); None keeps the default
+            quantize: Use int8 dynamic quantization for CPU inference
         """
         self.audio_processor = AudioProcessor(sound_dir=sound_dir)
         self.text_processor = TextProcessor()
-        self.tts_engine = TTSEngine(model_name=model_name, device=device)
+        self.tts_engine = TTSEngine(
+            model_name=model_name,
+            device=device,
+            half_precision=half_precision,
+            threads=threads,
+            quantize=quantize,
+        )
 
-        # Cache for selected voice samples
+        # Cache for selected voice samples, with the (num_samples, file versions)
+        # it was selected from
         self._voice_samples: Optional[List[Path]] = None
+        self._voice_samples_key: Optional[Tuple] = None
+
+        # Speaker conditioning latents are cached next to the samples
+        self.latents_cache_dir = self.audio_processor.sound_dir / ".cache"
 
     def initialize(self, require_transcript: bool = True) -> None:
         """Initialize the voice cloner (discover audio files, select samples).
@@ -57,14 +93,39 @@ class VoiceCloner:
                 raise ValueError("No audio files found!")
         
         self._select_voice_samples()
+        if self._voice_samples:
+            # Encode the default speaker now (or load it from cache) so requests skip it
+            self.tts_engine.get_conditioning_latents(
+                self._voice_samples[0], cache_dir=self.latents_cache_dir
+            )
         logger.info(f"Voice cloner initialized with {len(self.audio_processor.audio_files)} audio files")
 
+    def warm_up(self, text: str = "Warm up.") -> None:
+        """Run a throwaway synthesis so the first real request takes the warm path.
+
+        This pages the model weights in and lets PyTorch pick its kernels.
+
+        Args:
+            text: Short text to synthesize
+        """
+        logger.info("Warming up TTS model...")
+        self.synthesize_simple(text=text)
+        if torch.cuda.is_available():
+            torch.cuda.synchronize()
+        logger.info("TTS model warmed up")
+
     def _select_voice_samples(self, num_samples: int = 5) -> None:
         """Select best voice samples for cloning.
 
         Args:
             num_samples: Number of samples to select
         """
+        # Selection only depends on the discovered files and their contents
+        key = (num_samples, self._audio_files_version())
+        if self._voice_samples is not None and key == self._voice_samples_key:
+            return
+
+        self._voice_samples_key = key
         self._voice_samples = self.audio_processor.select_best_voice_samples(
             min_duration=2.0,
             max_duration=15.0,
@@ -79,6 +140,21 @@ class VoiceCloner:
 
         logger.info(f"Selected {len(self._voice_samples)} voice samples")
 
+    def _audio_files_version(self) -> Tuple[Tuple[str, int], ...]:
+        """Identify the current set of discovered audio files and their versions.
+
+        Returns:
+            Tuple of (path, mtime_ns) per discovered file; missing files get -1
+        """
+        version = []
+        for audio_file in self.audio_processor.audio_files:
+            try:
+                mtime_ns = audio_file.stat().st_mtime_ns
+            except OSError:
+                mtime_ns = -1
+            version.append((str(audio_file), mtime_ns))
+        return tuple(version)
+
     def get_voice_samples(self) -> List[Path]:
         """Get list of selected voice samples.
 
@@ -89,6 +165,47 @@ class VoiceCloner:
             self._select_voice_samples()
         return self._voice_samples.copy()
 
+    def get_voice_id(self) -> str:
+        """Identify the voice that default synthesis currently produces.
+
+        Changes whenever the model, the default speaker sample, or that sample's
+        contents change, so it can namespace cached audio.
+
+        Returns:
+            String of model name, speaker sample path and its mtime_ns
+        """
+        voice_samples = self.get_voice_samples()
+        if not voice_samples:
+            return self.tts_engine.model_name
+        speaker_sample = voice_samples[0]
+        try:
+            mtime_ns = speaker_sample.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+        return f"{self.tts_engine.model_name}|{speaker_sample}|{mtime_ns}"
+
+    def _resolve_speaker_sample(self, speaker_sample: Optional[str | Path] = None) -> Path:
+        """Resolve the speaker sample to clone.
+
+        Args:
+            speaker_sample: Optional path to specific speaker audio.
+                If None, uses best available sample.
+
+        Returns:
+            Path to an existing speaker sample
+        """
+        if speaker_sample is None:
+            voice_samples = self.get_voice_samples()
+            if not voice_samples:
+                raise ValueError("No voice samples available")
+            speaker_sample = voice_samples[0]  # Use first sample
+            logger.info(f"Using default voice sample: {speaker_sample}")
+
+        speaker_sample = Path(speaker_sample)
+        if not speaker_sample.exists():
+            raise FileNotFoundError(f"Speaker sample not found: {speaker_sample}")
+        return speaker_sample
+
     def clone_voice(
         self,
         text: str,
@@ -116,93 +233,65 @@ class VoiceCloner:
             logger.warning(f"Text is very long ({len(text)} chars), may take a while to process")
 
         # Preprocess text
-        text_chunks = self.text_processor.preprocess_for_tts(text, max_length=500)
+        text_chunks = self.text_processor.preprocess_for_tts(
+            text, max_length=SINGLE_CALL_LIMIT, max_sentence_length=CHUNK_MAX_LENGTH
+        )
         logger.info(f"Text split into {len(text_chunks)} chunks")
 
-        # Select speaker sample
-        if speaker_sample is None:
-            voice_samples = self.get_voice_samples()
-            if not voice_samples:
-                raise ValueError("No voice samples available")
-            speaker_sample = voice_samples[0]  # Use first sample
-            logger.info(f"Using default voice sample: {speaker_sample}")
+        speaker_sample = self._resolve_speaker_sample(speaker_sample)
 
-        speaker_sample = Path(speaker_sample)
-        if not speaker_sample.exists():
-            raise FileNotFoundError(f"Speaker sample not found: {speaker_sample}")
+        # Encode the speaker once and reuse it for every chunk
+        gpt_cond_latent, speaker_embedding = self.tts_engine.get_conditioning_latents(
+            speaker_sample, cache_dir=self.latents_cache_dir
+        )
 
         # Synthesize each chunk and concatenate
         audio_segments = []
-        chunk_files_to_cleanup = []
-        
-        try:
-            for i, chunk in enumerate(text_chunks):
-                logger.info(f"Processing chunk {i+1}/{len(text_chunks)}")
-                
-                # Use temporary file for chunks
-                chunk_output = None
-                if output_path:
-                    # Convert to Path if it's a string
-                    output_path_obj = Path(output_path) if isinstance(output_path, str) else output_path
-                    chunk_output = Path(tempfile.gettempdir()) / f"chunk_{i}_{output_path_obj.stem}.wav"
-                    chunk_files_to_cleanup.append(chunk_output)
-
-                audio = self.tts_engine.synthesize(
-                    text=chunk,
-                    speaker_wav=speaker_sample,
-                    language=language,
-                    output_path=chunk_output,
-                )
-                audio_segments.append(audio)
-        finally:
-            # Cleanup temporary chunk files
-            for chunk_file in chunk_files_to_cleanup:
-                try:
-                    if chunk_file.exists():
-                        chunk_file.unlink()
-                except Exception as e:
-                    logger.warning(f"Could not cleanup chunk file {chunk_file}: {e}")
+        for i, chunk in enumerate(text_chunks):
+            logger.info(f"Processing chunk {i+1}/{len(text_chunks)}")
+            audio = self.tts_engine.synthesize_with_latents(
+                text=chunk,
+                gpt_cond_latent=gpt_cond_latent,
+                speaker_embedding=speaker_embedding,
+                language=language,
+            )
+            audio_segments.append(audio)
 
         # Ensure all segments have the same sample rate and format
-        sample_rate = 22050  # XTTS standard sample rate
-        
-        # Normalize and concatenate all segments with small pauses
-        normalized_segments = []
-        pause_duration = 0.2  # 0.2 seconds pause between chunks
-        pause_samples = int(sample_rate * pause_duration)
-        pause = np.zeros(pause_samples, dtype=np.float32)
+        sample_rate = OUTPUT_SAMPLE_RATE
         
+        # Segments are mono float32 (the engine downmixes), so the output length
+        # is known up front
+        pause_samples = int(sample_rate * PAUSE_DURATION)
+        last_index = len(audio_segments) - 1
+        total_samples = sum(
+            len(audio) + (pause_samples if i < last_index else 0)
+            for i, audio in enumerate(audio_segments)
+            if len(audio) > 0
+        )
+
+        # Copy segments and pauses straight into one preallocated buffer. Segments
+        # come back from the engine already peak-normalized, so only the joined
+        # audio is scaled below.
+        final_audio = np.empty(total_samples, dtype=np.float32)
+        offset = 0
+        max_val = 0.0  # Running peak; pauses are silent and never raise it
         for i, audio in enumerate(audio_segments):
-            # Ensure audio is 1D array
-            if audio.ndim > 1:
-                audio = np.mean(audio, axis=0)
-            
-            # Ensure same sample rate (resample if needed)
-            if len(audio) > 0:
-                # Normalize audio to prevent clipping
-                max_val = np.abs(audio).max()
-                if max_val > 0:
-                    audio = audio / max_val * 0.95  # Leave headroom
-                
-                normalized_segments.append(audio)
-                
-                # Add pause between chunks (except after last one)
-                if i < len(audio_segments) - 1:
-                    normalized_segments.append(pause)
-        
-        # Concatenate all segments
-        if len(normalized_segments) == 1:
-            final_audio = normalized_segments[0]
-        else:
-            final_audio = np.concatenate(normalized_segments)
-        
-        # Final normalization to ensure proper range
-        max_val = np.abs(final_audio).max()
+            if len(audio) == 0:
+                continue
+            segment = final_audio[offset : offset + len(audio)]
+            segment[:] = audio
+            max_val = max(max_val, float(segment.max()), float(-segment.min()))
+            offset += len(audio)
+
+            # Add pause between chunks (except after last one)
+            if i < last_index:
+                final_audio[offset : offset + pause_samples] = 0.0
+                offset += pause_samples
+
+        # Single normalization pass over the final audio, in place
         if max_val > 0:
-            final_audio = final_audio / max_val * 0.95
-        
-        # Ensure proper dtype
-        final_audio = final_audio.astype(np.float32)
+            np.multiply(final_audio, np.float32(0.95 / max_val), out=final_audio)
         
         # Apply subtle deep voice processing (very light pitch shift)
         # Uses -1.2 semitones for subtle depth while preserving natural voice
@@ -210,14 +299,12 @@ class VoiceCloner:
         final_audio = deepen_voice(
             audio=final_audio,
             sample_rate=sample_rate,
-            pitch_shift_semitones=-1.2,  # Very subtle pitch shift
+            pitch_shift_semitones=DEEPEN_PITCH_SHIFT,  # Very subtle pitch shift
             enabled=True,
         )
 
         # Save final output if path provided
         if output_path:
-            import soundfile as sf
-            
             # Convert to Path if it's a string
             output_path_obj = Path(output_path) if isinstance(output_path, str) else output_path
             
@@ -227,7 +314,7 @@ class VoiceCloner:
             # Save with proper format
             sf.write(
                 str(output_path_obj),
-                final_audio,
+                to_pcm16(final_audio),
                 sample_rate,
                 subtype='PCM_16'  # Use 16-bit PCM for better compatibility
             )
@@ -251,3 +338,110 @@ class VoiceCloner:
         """
         return self.clone_voice(text=text, output_path=output_path)
 
+    def stream_clone_voice(
+        self,
+        text: str,
+        speaker_sample: Optional[str | Path] = None,
+        language: str = "en",
+    ) -> Iterator[np.ndarray]:
+        """Clone voice chunk by chunk, yielding audio as soon as each chunk is ready.
+
+        Only one chunk is held in memory at a time. Each chunk is deepened on its
+        own, so the result can differ slightly from clone_voice(), which
+        normalizes and deepens the concatenated audio once.
+
+        Args:
+            text: Text to synthesize
+            speaker_sample: Optional path to specific speaker audio.
+                If None, uses best available sample.
+            language: Language code
+
+        Yields:
+            Audio arrays at OUTPUT_SAMPLE_RATE; every chunk but the last ends with
+            the inter-chunk pause
+        """
+        if not text:
+            raise ValueError("Text cannot be empty")
+
+        text_chunks = self.text_processor.preprocess_for_tts(text, max_length=CHUNK_MAX_LENGTH)
+        logger.info(f"Streaming {len(text_chunks)} chunks")
+
+        speaker_sample = self._resolve_speaker_sample(speaker_sample)
+        gpt_cond_latent, speaker_embedding = self.tts_engine.get_conditioning_latents(
+            speaker_sample, cache_dir=self.latents_cache_dir
+        )
+        pause_samples = int(OUTPUT_SAMPLE_RATE * PAUSE_DURATION)
+
+        for i, chunk in enumerate(text_chunks):
+            logger.info(f"Processing chunk {i+1}/{len(text_chunks)}")
+            # Already peak-normalized by the engine
+            audio = self.tts_engine.synthesize_with_latents(
+                text=chunk,
+                gpt_cond_latent=gpt_cond_latent,
+                speaker_embedding=speaker_embedding,
+                language=language,
+            )
+            if len(audio) == 0:
+                continue
+
+            audio = deepen_voice(
+                audio=audio,
+                sample_rate=OUTPUT_SAMPLE_RATE,
+                pitch_shift_semitones=DEEPEN_PITCH_SHIFT,
+                enabled=True,
+            )
+
+            if i < len(text_chunks) - 1:
+                audio = np.concatenate([audio, np.zeros(pause_samples, dtype=audio.dtype)])
+            yield audio
+
+    def synthesize_streaming(
+        self,
+        text: str,
+        language: str = "en",
+    ) -> Iterator[np.ndarray]:
+        """Stream text with automatic voice sample selection.
+
+        Args:
+            text: Text to synthesize
+            language: Language code
+
+        Returns:
+            Iterator over audio chunks (see stream_clone_voice)
+        """
+        return self.stream_clone_voice(text=text, language=language)
+
+    def iter_synthesize_batch(
+        self,
+        texts: List[str],
+        return_exceptions: bool = False,
+    ) -> Iterator[np.ndarray | Exception]:
+        """Synthesize several texts, yielding each result as soon as it is ready.
+
+        The XTTS API has no batched decoder, so texts run back to back on the
+        loaded model; the speaker sample is selected once for the whole batch.
+
+        Args:
+            texts: Texts to synthesize
+            return_exceptions: If True, a failing text yields its exception
+                instead of aborting the batch
+
+        Yields:
+            Audio arrays (or exceptions) in the same order as texts
+        """
+        voice_samples = self.get_voice_samples()
+        if not voice_samples:
+            raise ValueError("No voice samples available")
+        speaker_sample = voice_samples[0]
+
+        for text in texts:
+            try:
+                audio = self.clone_voice(text=text, speaker_sample=speaker_sample)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                logger.error(f"Error synthesizing batch item: {e}")
+                yield e
+                continue
+            yield audio
+
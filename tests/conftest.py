@@ -0,0 +1,35 @@
+"""Shared pytest fixtures.
+
+Model-backed fixtures are session-scoped so the XTTS weights are loaded at most
+once per test run; they skip when the TTS package is not installed.
+"""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+
+@pytest.fixture(scope="session")
+def tts_engine():
+    """Session-wide TTSEngine."""
+    pytest.importorskip("TTS")
+    from src.tts_engine import TTSEngine
+
+    return TTSEngine()
+
+
+@pytest.fixture(scope="session")
+def voice_cloner(tmp_path_factory, tts_engine):
+    """Session-wide VoiceCloner over a generated speaker sample.
+
+    Depends on tts_engine so the model is loaded once and shared by both.
+    """
+    from src.voice_cloner import VoiceCloner
+
+    sound_dir = tmp_path_factory.mktemp("sound")
+    t = np.arange(3 * 22050, dtype=np.float32) / 22050
+    sf.write(str(sound_dir / "speaker.wav"), 0.5 * np.sin(2 * np.pi * 150 * t), 22050)
+
+    cloner = VoiceCloner(sound_dir=sound_dir)
+    cloner.initialize(require_transcript=False)
+    return cloner
@@ -0,0 +1,98 @@
+"""Tests for audio cache module."""
+
+import os
+
+import numpy as np
+import soundfile as sf
+
+from src.audio_cache import AudioCache
+
+
+def test_put_and_get():
+    """Test storing and retrieving audio."""
+    cache = AudioCache()
+    audio = np.ones(100, dtype=np.float32)
+
+    assert cache.get("Hello") is None
+    cache.put("Hello", audio)
+
+    assert cache.get("Hello") is audio
+    # Surrounding whitespace does not change the key
+    assert cache.get("  Hello  ") is audio
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted."""
+    cache = AudioCache(max_entries=2)
+    cache.put("a", np.zeros(1, dtype=np.float32))
+    cache.put("b", np.zeros(1, dtype=np.float32))
+    cache.get("a")
+    cache.put("c", np.zeros(1, dtype=np.float32))
+
+    assert len(cache) == 2
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_long_text_not_cached():
+    """Test that texts above max_text_length are skipped."""
+    cache = AudioCache(max_text_length=10)
+    cache.put("x" * 11, np.zeros(1, dtype=np.float32))
+
+    assert len(cache) == 0
+    assert cache.get("x" * 11) is None
+
+
+def test_disk_persistence(tmp_path):
+    """Test that entries survive a new cache instance."""
+    audio = np.linspace(-0.5, 0.5, 2205).astype(np.float32)
+    AudioCache(cache_dir=tmp_path).put("Persist me", audio)
+
+    restored = AudioCache(cache_dir=tmp_path).get("Persist me")
+
+    assert restored is not None
+    assert restored.dtype == np.float32
+    np.testing.assert_allclose(restored, audio)
+
+
+def test_voices_are_cached_separately():
+    """Test that the same text in another voice is a miss."""
+    cache = AudioCache()
+    audio = np.ones(100, dtype=np.float32)
+    cache.put("Hello", audio, voice_id="model|a.wav|1")
+
+    assert cache.get("Hello", voice_id="model|a.wav|1") is audio
+    assert cache.get("Hello", voice_id="model|a.wav|2") is None
+    assert cache.get("Hello", voice_id="model|b.wav|1") is None
+
+
+def test_disk_entries_are_capped(tmp_path):
+    """Test that the least recently used WAV files are deleted beyond the cap."""
+    cache = AudioCache(cache_dir=tmp_path, max_disk_entries=2)
+    for i, text in enumerate(["a", "b", "c"]):
+        cache.put(text, np.zeros(10, dtype=np.float32))
+        # Distinct mtimes regardless of filesystem timestamp resolution
+        path = tmp_path / f"{AudioCache.make_key(text)}.wav"
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+
+    cache.put("d", np.zeros(10, dtype=np.float32))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"{AudioCache.make_key(text)}.wav" for text in ["c", "d"]
+    )
+
+
+def test_failed_disk_write_leaves_no_file(tmp_path, monkeypatch):
+    """Test that a failed write leaves neither a partial entry nor a temp file."""
+
+    def failing_write(path, *args, **kwargs):
+        with open(path, "wb") as f:
+            f.write(b"RIFF")
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(sf, "write", failing_write)
+    AudioCache(cache_dir=tmp_path).put("Hello", np.zeros(10, dtype=np.float32))
+
+    assert list(tmp_path.iterdir()) == []
+    assert AudioCache(cache_dir=tmp_path).get("Hello") is None
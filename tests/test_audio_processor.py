@@ -1,9 +1,13 @@
 """Tests for audio processor module."""
 
-import pytest
+import os
 from pathlib import Path
 
-from src.audio_processor import AudioProcessor
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src.audio_processor import AudioProcessor, to_pcm16
 
 
 def test_audio_processor_initialization():
@@ -30,11 +34,32 @@ def test_discover_audio_files(tmp_path):
     assert all(f.suffix == ".wav" for f in files)
 
 
+def test_discover_audio_files_rescans_on_change(tmp_path, monkeypatch):
+    """Test that discovery reuses the listing until the directory changes."""
+    test_dir = tmp_path / "sound"
+    test_dir.mkdir()
+    (test_dir / "test1.wav").touch()
+
+    processor = AudioProcessor(sound_dir=test_dir)
+    assert len(processor.discover_audio_files(require_transcript=False)) == 1
+
+    # Unchanged directory: no directory listing at all
+    def fail_scandir(*args, **kwargs):
+        raise AssertionError("directory should not be listed again")
+
+    monkeypatch.setattr(os, "scandir", fail_scandir)
+    assert len(processor.discover_audio_files(require_transcript=False)) == 1
+    monkeypatch.undo()
+
+    # New file bumps the directory mtime and triggers a re-scan
+    (test_dir / "test2.wav").touch()
+    mtime_ns = test_dir.stat().st_mtime_ns + 1_000_000
+    os.utime(test_dir, ns=(mtime_ns, mtime_ns))
+    assert len(processor.discover_audio_files(require_transcript=False)) == 2
+
+
 def test_get_audio_info(tmp_path):
     """Test getting audio file info."""
-    import soundfile as sf
-    import numpy as np
-    
     # Create a temporary WAV file
     test_dir = tmp_path / "sound"
     test_dir.mkdir()
@@ -54,10 +79,68 @@ def test_get_audio_info(tmp_path):
     assert info["sample_rate"] == sample_rate
 
 
+def test_get_audio_info_is_cached(tmp_path, monkeypatch):
+    """Test that audio info is reused until the file changes and survives restarts."""
+    test_dir = tmp_path / "sound"
+    test_dir.mkdir()
+    test_file = test_dir / "test.wav"
+    sf.write(str(test_file), np.zeros(22050, dtype=np.float32), 22050)
+
+    processor = AudioProcessor(sound_dir=test_dir)
+    processor.discover_audio_files(require_transcript=False)
+    assert len(processor.get_all_audio_info()) == 1
+
+    def fail_info(*args, **kwargs):
+        raise AssertionError("sf.info should not be called on a warm cache")
+
+    monkeypatch.setattr(sf, "info", fail_info)
+
+    # Same instance and a fresh instance (persisted cache) both skip sf.info
+    assert processor.get_audio_info(test_file)["duration"] == 1.0
+    restarted = AudioProcessor(sound_dir=test_dir)
+    restarted.discover_audio_files(require_transcript=False)
+    assert restarted.get_audio_info(test_file)["duration"] == 1.0
+
+
+def test_saving_info_cache_keeps_listing_cache(tmp_path, monkeypatch):
+    """Test that persisting audio info does not invalidate the directory listing."""
+    test_dir = tmp_path / "sound"
+    (test_dir / ".cache").mkdir(parents=True)
+    sf.write(str(test_dir / "test.wav"), np.zeros(22050, dtype=np.float32), 22050)
+
+    processor = AudioProcessor(sound_dir=test_dir)
+    processor.discover_audio_files(require_transcript=False)
+    dir_mtime = test_dir.stat().st_mtime_ns
+    processor.get_all_audio_info()
+
+    assert test_dir.stat().st_mtime_ns == dir_mtime
+    monkeypatch.setattr(os, "scandir", lambda *args, **kwargs: pytest.fail("re-listed"))
+    assert len(processor.discover_audio_files(require_transcript=False)) == 1
+
+
+def test_load_audio_resamples_and_downmixes(tmp_path):
+    """Test loading a stereo file at a different sample rate."""
+    test_file = tmp_path / "stereo.wav"
+    t = np.linspace(0, 1, 44100, endpoint=False)
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    sf.write(str(test_file), np.stack([tone, tone], axis=1), 44100)
+
+    processor = AudioProcessor(sound_dir=tmp_path)
+    audio, sr = processor.load_audio(test_file)
+
+    assert sr == 22050
+    assert audio.ndim == 1
+    assert audio.dtype == np.float32
+    assert abs(len(audio) - 22050) <= 1
+    assert np.abs(audio).max() == pytest.approx(1.0, abs=1e-3)
+
+    # Duration is honoured before resampling
+    audio, _ = processor.load_audio(test_file, duration=0.5)
+    assert abs(len(audio) - 11025) <= 1
+
+
 def test_normalize_audio():
     """Test audio normalization."""
-    import numpy as np
-    
     processor = AudioProcessor()
     
     # Test with audio that needs normalization
@@ -71,3 +154,107 @@ def test_normalize_audio():
     normalized = processor.normalize_audio(empty_audio)
     assert len(normalized) == 0
 
+
+
+def test_select_best_voice_samples(tmp_path):
+    """Test duration-based sample selection over a probed directory."""
+    for name, seconds in [("a.wav", 1.0), ("b.wav", 3.0), ("c.wav", 4.0), ("d.wav", 20.0)]:
+        sf.write(str(tmp_path / name), np.zeros(int(8000 * seconds), dtype=np.float32), 8000)
+    (tmp_path / "broken.wav").write_bytes(b"not a wav")
+
+    processor = AudioProcessor(sound_dir=tmp_path)
+    processor.discover_audio_files(require_transcript=False)
+
+    assert len(processor.get_all_audio_info()) == 4
+    selected = processor.select_best_voice_samples(min_duration=2.0, max_duration=15.0)
+    assert [p.name for p in selected] == ["b.wav", "c.wav"]
+    assert processor.select_best_voice_samples(max_samples=1) == selected[:1]
+
+
+def test_select_best_voice_samples_skips_probing_by_size(tmp_path, monkeypatch):
+    """Test that files far outside the duration range are not probed."""
+    for name, seconds in [("a.wav", 3.0), ("b.wav", 0.5), ("c.wav", 60.0)]:
+        sf.write(str(tmp_path / name), np.zeros(int(8000 * seconds), dtype=np.float32), 8000)
+
+    processor = AudioProcessor(sound_dir=tmp_path)
+    processor.discover_audio_files(require_transcript=False)
+
+    probed = []
+    real_info = sf.info
+    monkeypatch.setattr(sf, "info", lambda path: probed.append(Path(path).name) or real_info(path))
+
+    selected = processor.select_best_voice_samples(min_duration=2.0, max_duration=15.0)
+    assert [p.name for p in selected] == ["a.wav"]
+    assert probed == ["a.wav"]
+
+
+def test_size_filter_handles_mixed_formats(tmp_path):
+    """Test that the size filter uses each file's own format, not the first file's."""
+    sf.write(str(tmp_path / "a.wav"), np.zeros(16000 * 3, dtype=np.float32), 16000, subtype="PCM_16")
+    # 5 s of 44.1 kHz stereo is larger than 15 s of the first file's format
+    sf.write(str(tmp_path / "b.wav"), np.zeros((44100 * 5, 2), dtype=np.float32), 44100, subtype="PCM_16")
+    # 1 s of 48 kHz float is too short, though its size fits 2-15 s of the first file's format
+    sf.write(str(tmp_path / "c.wav"), np.zeros(48000, dtype=np.float32), 48000, subtype="FLOAT")
+    (tmp_path / "d.wav").write_bytes(b"not a wav file")
+
+    processor = AudioProcessor(sound_dir=tmp_path)
+    processor.discover_audio_files(require_transcript=False)
+
+    kept = processor._filter_by_size(processor.audio_files, min_duration=2.0, max_duration=15.0)
+    # Unreadable headers are left for probing to reject
+    assert [p.name for p in kept] == ["a.wav", "b.wav", "d.wav"]
+
+
+def test_size_filter_uses_warm_info_cache(tmp_path, monkeypatch):
+    """Test that a warm info cache lets selection run without opening any file."""
+    for name, seconds in [("a.wav", 1.0), ("b.wav", 3.0), ("c.wav", 20.0)]:
+        sf.write(str(tmp_path / name), np.zeros(int(8000 * seconds), dtype=np.float32), 8000)
+    AudioProcessor(sound_dir=tmp_path).select_best_voice_samples(
+        min_duration=2.0, max_duration=15.0
+    )
+
+    processor = AudioProcessor(sound_dir=tmp_path)
+    processor.discover_audio_files(require_transcript=False)
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("no file should be opened on a warm cache")
+
+    monkeypatch.setattr("builtins.open", fail_open)
+    monkeypatch.setattr(sf, "info", fail_open)
+
+    selected = processor.select_best_voice_samples(min_duration=2.0, max_duration=15.0)
+    assert [p.name for p in selected] == ["b.wav"]
+
+
+def test_trim_silence():
+    """Test that leading and trailing silence is trimmed."""
+    processor = AudioProcessor()
+    t = np.arange(22050, dtype=np.float32) / 22050
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    audio = np.concatenate([np.zeros(22050), tone, np.zeros(22050)]).astype(np.float32)
+
+    trimmed = processor.trim_silence(audio, top_db=20)
+
+    # Frame-level precision: within one frame of the tone boundaries
+    assert abs(len(trimmed) - len(tone)) <= 2048
+    assert np.abs(trimmed).max() == pytest.approx(0.5, abs=1e-3)
+
+    # Pure silence is returned unchanged
+    silence = np.zeros(4096, dtype=np.float32)
+    assert len(processor.trim_silence(silence)) == 4096
+
+
+def test_to_pcm16_matches_soundfile(tmp_path):
+    """Test that PCM16 packing clips and matches libsndfile's conversion."""
+    audio = np.array([0.0, 0.5, -0.5, 1.0, -1.0, 1.5, -2.0, 1e-5], dtype=np.float32)
+
+    pcm = to_pcm16(audio)
+    assert pcm.dtype == np.int16
+    assert pcm.tolist()[:5] == [0, 16384, -16384, 32767, -32768]
+    assert pcm[5] == 32767 and pcm[6] == -32768
+
+    # Same samples as letting libsndfile convert in-range floats itself
+    in_range = audio[np.abs(audio) <= 1.0]
+    sf.write(str(tmp_path / "float.wav"), in_range, 22050, subtype="PCM_16")
+    expected, _ = sf.read(str(tmp_path / "float.wav"), dtype="int16")
+    np.testing.assert_array_equal(to_pcm16(in_range), expected)
@@ -0,0 +1,148 @@
+"""Tests for request batcher module."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.request_batcher import RequestBatcher
+
+
+def test_concurrent_requests_are_batched():
+    """Test that concurrent submissions share one batch call."""
+    calls = []
+
+    def process_batch(texts):
+        calls.append(list(texts))
+        return [text.upper() for text in texts]
+
+    async def run():
+        batcher = RequestBatcher(process_batch, max_batch_size=4, batch_window_ms=50)
+        return await asyncio.gather(*(batcher.submit(t) for t in ["a", "b", "c"]))
+
+    results = asyncio.run(run())
+
+    assert results == ["A", "B", "C"]
+    assert calls == [["a", "b", "c"]]
+
+
+def test_duplicate_texts_processed_once():
+    """Test that identical texts in a batch are only processed once."""
+    calls = []
+
+    def process_batch(texts):
+        calls.append(list(texts))
+        return [len(text) for text in texts]
+
+    async def run():
+        batcher = RequestBatcher(process_batch, batch_window_ms=50)
+        return await asyncio.gather(batcher.submit("abc"), batcher.submit("abc"))
+
+    assert asyncio.run(run()) == [3, 3]
+    assert calls == [["abc"]]
+
+
+def test_max_batch_size():
+    """Test that batches never exceed max_batch_size."""
+    calls = []
+
+    def process_batch(texts):
+        calls.append(list(texts))
+        return texts
+
+    async def run():
+        batcher = RequestBatcher(process_batch, max_batch_size=2, batch_window_ms=50)
+        return await asyncio.gather(*(batcher.submit(str(i)) for i in range(5)))
+
+    assert asyncio.run(run()) == ["0", "1", "2", "3", "4"]
+    assert all(len(batch) <= 2 for batch in calls)
+
+
+def test_errors_are_raised_per_request():
+    """Test that exceptions are delivered only to the failing request."""
+
+    def process_batch(texts):
+        return [ValueError(text) if text == "bad" else text for text in texts]
+
+    async def run():
+        batcher = RequestBatcher(process_batch, batch_window_ms=50)
+        return await asyncio.gather(
+            batcher.submit("good"), batcher.submit("bad"), return_exceptions=True
+        )
+
+    good, bad = asyncio.run(run())
+    assert good == "good"
+    assert isinstance(bad, ValueError)
+
+
+def test_batch_failure_propagates():
+    """Test that a failing batch call fails every request in it."""
+
+    def process_batch(texts):
+        raise RuntimeError("model not loaded")
+
+    async def run():
+        batcher = RequestBatcher(process_batch)
+        await batcher.submit("text")
+
+    with pytest.raises(RuntimeError, match="model not loaded"):
+        asyncio.run(run())
+
+
+def test_results_delivered_as_they_finish():
+    """Test that a request resolves before later texts in its batch finish."""
+    events = []
+
+    def process_batch(texts):
+        for text in texts:
+            if text == "slow":
+                time.sleep(0.2)
+                events.append("slow processed")
+            yield text
+
+    async def submit_and_record(batcher, text):
+        result = await batcher.submit(text)
+        events.append(f"{text} resolved")
+        return result
+
+    async def run():
+        batcher = RequestBatcher(process_batch, batch_window_ms=50)
+        return await asyncio.gather(
+            submit_and_record(batcher, "fast"), submit_and_record(batcher, "slow")
+        )
+
+    assert asyncio.run(run()) == ["fast", "slow"]
+    assert events == ["fast resolved", "slow processed", "slow resolved"]
+
+
+def test_result_count_mismatch_fails_requests():
+    """Test that a short result list fails every request instead of hanging."""
+    calls = []
+
+    def process_batch(texts):
+        calls.append(list(texts))
+        return texts[:1]
+
+    async def run():
+        batcher = RequestBatcher(process_batch, batch_window_ms=50)
+        first = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+        # The worker must survive and keep serving requests
+        second = await batcher.submit("c")
+        return first, second
+
+    (a, b), c = asyncio.run(run())
+    assert isinstance(a, RuntimeError)
+    assert isinstance(b, RuntimeError)
+    assert c == "c"
+
+
+def test_idle_request_skips_batch_window():
+    """Test that a lone request is dispatched without waiting for the window."""
+
+    async def run():
+        batcher = RequestBatcher(lambda texts: texts, batch_window_ms=5000)
+        return await asyncio.wait_for(batcher.submit("alone"), timeout=1.0)
+
+    assert asyncio.run(run()) == "alone"
@@ -26,6 +26,14 @@ def test_normalize_text():
     assert "đẹp" in normalized
 
 
+def test_normalize_keeps_vietnamese_diacritics():
+    """Test that accented characters survive special-character cleaning."""
+    processor = TextProcessor()
+
+    text = "Xin chào, đây là tiếng Việt có dấu: ắ ằ ẳ ẵ ặ ố ồ ổ ỗ ộ ự ỹ..."
+    assert processor.normalize_text(text) == text
+
+
 def test_tokenize():
     """Test text tokenization."""
     processor = TextProcessor()
@@ -69,3 +77,68 @@ def test_empty_text():
     assert processor.tokenize("") == []
     assert processor.split_sentences("") == []
 
+
+
+def test_preprocess_for_tts_respects_max_length():
+    """Test that grouped chunks never exceed max_length."""
+    processor = TextProcessor()
+
+    text = " ".join(f"Sentence number {i} is here." for i in range(50))
+    chunks = processor.preprocess_for_tts(text, max_length=80)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 80 for chunk in chunks)
+
+
+def test_chunk_text_splits_long_sentences():
+    """Test that one overlong sentence is split even when chunks may be larger."""
+    processor = TextProcessor()
+
+    long_sentence = " ".join(["word"] * 150) + "."  # 750 characters
+    text = f"Short intro. {long_sentence} Short outro."
+    chunks = processor._chunk_text(text, max_length=2000, max_sentence_length=500)
+
+    assert chunks[0] == "Short intro."
+    assert chunks[-1] == "Short outro."
+    assert all(len(chunk) <= 500 for chunk in chunks)
+    # Pieces break between words
+    assert " ".join(chunks[1:-1]) == long_sentence
+    # Without an overlong sentence the whole text stays one call
+    assert processor._chunk_text("One. Two.", max_length=2000, max_sentence_length=5) == [
+        "One. Two."
+    ]
+
+
+def test_split_sentences_keeps_punctuation():
+    """Test that sentences keep their ending punctuation."""
+    processor = TextProcessor()
+
+    sentences = processor.split_sentences("First one. Second one!  Third")
+    assert sentences == ["First one.", "Second one!", "Third"]
+
+
+def test_tokenize_words_and_punctuation():
+    """Test that tokenization separates punctuation and keeps contractions."""
+    processor = TextProcessor()
+
+    tokens = processor.tokenize("Don't stop, well-known story!")
+    assert tokens == ["Don't", "stop", ",", "well-known", "story", "!"]
+
+
+def test_abbreviation_matcher_is_shared():
+    """Test that instances reuse the compiled abbreviation pattern."""
+    assert TextProcessor()._abbreviation_re is TextProcessor()._abbreviation_re
+
+
+def test_preprocess_for_tts_is_cached():
+    """Test that repeated preprocessing reuses the cached chunks."""
+    processor = TextProcessor()
+    text = " ".join(f"Sentence number {i} is here." for i in range(20))
+
+    first = processor.preprocess_for_tts(text, max_length=80)
+    processor.normalize_text = None  # Any recomputation would now fail
+    second = processor.preprocess_for_tts(text, max_length=80)
+
+    assert second == first
+    # Callers get their own list
+    second.append("extra")
+    assert processor.preprocess_for_tts(text, max_length=80) == first